@@ -5,6 +5,8 @@ import datetime
 import socket
 import struct
 
+import six
+
 from weatherlink.models import (
 	calculate_weatherlink_crc,
 	RainCollectorTypeSerial,
@@ -17,7 +19,7 @@ with open('tests/scripts/test-loop-output.bin', 'wb') as handle:
 
 	handle.write(struct.pack('<L', timestamp))
 
-	handle.write('\n')
+	handle.write(b'\n')
 
 	print('Connecting to WeatherLinkIP...')
 	sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -25,9 +27,9 @@ with open('tests/scripts/test-loop-output.bin', 'wb') as handle:
 	print()
 
 	print('Reading rain collector size...')
-	sock.sendall('EEBRD 2B 01\n')  # "read the EEPROM," "start at position x2B / 43 (setup bits)," "read 0x01 / 1 bytes"
+	sock.sendall(b'EEBRD 2B 01\n')  # "read the EEPROM," "start at position x2B / 43 (setup bits)," "read 0x01 / 1 bytes"
 	ack = sock.recv(1)
-	if ack == chr(curses.ascii.ACK):
+	if ack == six.int2byte(curses.ascii.ACK):
 		print('Expected ACK received...')
 	else:
 		print('Unknown ACK received: %s...' % ack)
@@ -36,7 +38,7 @@ with open('tests/scripts/test-loop-output.bin', 'wb') as handle:
 	handle.write(ack)
 	handle.write(setup_bits)
 	handle.write(crc)
-	handle.write('\n')
+	handle.write(b'\n')
 	print('CRC: %s vs %s = result %s...' % (
 		calculate_weatherlink_crc(setup_bits),
 		struct.unpack_from('<h', crc)[0],
@@ -47,16 +49,16 @@ with open('tests/scripts/test-loop-output.bin', 'wb') as handle:
 	print()
 
 	print('Requesting loop packets...')
-	sock.sendall('LPS 2 30\n')  # "request loop packets," "type LOOP2," "30 packets"
+	sock.sendall(b'LPS 2 30\n')  # "request loop packets," "type LOOP2," "30 packets"
 
 	ack = sock.recv(1)
-	if ack == chr(curses.ascii.ACK):
+	if ack == six.int2byte(curses.ascii.ACK):
 		print('Expected ACK received...')
 	else:
 		print('Unknown ACK received: %s...' % ack)
 	handle.write(struct.pack('<B', ord(ack)))
 
-	sock_file = sock.makefile()
+	sock_file = sock.makefile('rb')
 	for i in range(0, 15):
 		data = sock_file.read(99)
 		handle.write(data)
@@ -0,0 +1,277 @@
+from __future__ import absolute_import
+
+import bz2
+from datetime import datetime
+from decimal import Decimal
+import mock
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import pytz
+
+from weatherlink.exporter.mysql import (
+	DEFAULT_MAX_ALLOWED_PACKET,
+	ESTIMATED_BYTES_PER_VALUE,
+	MySQLExporter,
+)
+from weatherlink.importer import Importer
+from weatherlink.models import RecordDict
+
+
+class _PreparedCursor(object):
+	# Behaves like MySQLCursorPrepared, which prepares a statement again whenever it is not passed the identical
+	# statement object it executed last
+	def __init__(self):
+		self.prepare_count = 0
+		self.executed = []
+		self._executed = None
+
+	def execute(self, operation, params=None):
+		if operation is not self._executed:
+			self._executed = operation
+			self.prepare_count += 1
+		self.executed.append((operation, params, ))
+
+	def close(self):
+		pass
+
+
+class TestMySQLExporter(TestCase):
+	def setUp(self):
+		self.exporter = MySQLExporter('weather', 'secret', 'weather')
+
+		self.cursor = mock.MagicMock()
+		self.prepared_cursor = mock.MagicMock()
+		self.connection = mock.MagicMock()
+		self.connection.cursor.side_effect = lambda prepared=False: self.prepared_cursor if prepared else self.cursor
+
+	def _connect(self, max_allowed_packet_row):
+		self.cursor.fetchone.return_value = max_allowed_packet_row
+		with mock.patch('mysql.connector.connect', return_value=self.connection):
+			self.exporter.connect()
+
+	@staticmethod
+	def _get_columns(statement):
+		return statement.split('(', 1)[1].split(')', 1)[0].split(', ')
+
+	def _get_inserted_rows(self):
+		rows = []
+		for (statement, batch), _ in self.cursor.executemany.call_args_list:
+			rows.extend(dict(zip(self._get_columns(statement), arguments)) for arguments in batch)
+		return rows
+
+	@staticmethod
+	def _get_record(minute, date=None):
+		return RecordDict({
+			'date': date or datetime(2016, 4, 1, 0, minute),
+			'minutes_covered': 5,
+			'temperature_outside': Decimal('63.2'),
+			'humidity_outside': Decimal('96.0'),
+			'barometric_pressure': Decimal('29.642'),
+		})
+
+	def test_connect_reads_max_allowed_packet(self):
+		self._connect(('max_allowed_packet', '67108864', ))
+
+		self.cursor.execute.assert_called_once_with("SHOW VARIABLES LIKE 'max_allowed_packet';")
+		self.assertEqual(67108864, self.exporter._max_allowed_packet)
+
+	def test_connect_falls_back_to_default_max_allowed_packet(self):
+		self.exporter._max_allowed_packet = 1024  # left over from an earlier connection
+
+		with mock.patch('weatherlink.exporter.mysql.logger') as mock_logger:
+			self._connect(None)
+
+		self.assertEqual(DEFAULT_MAX_ALLOWED_PACKET, self.exporter._max_allowed_packet)
+		self.assertEqual(1, mock_logger.debug.call_count)
+		self.assertIn(DEFAULT_MAX_ALLOWED_PACKET, mock_logger.debug.call_args[0])
+
+	def test_export_records_batches(self):
+		column_count = len(self.exporter._get_archive_column_list())
+		self._connect(('max_allowed_packet', str(2 * column_count * ESTIMATED_BYTES_PER_VALUE), ))
+		self.assertEqual(2, self.exporter._get_batch_size(column_count))
+
+		self.exporter.export_records([self._get_record(minute) for minute in range(5, 30, 5)])
+
+		self.assertEqual([2, 2, 1], [len(c[0][1]) for c in self.cursor.executemany.call_args_list])
+		statements = set(c[0][0] for c in self.cursor.executemany.call_args_list)
+		self.assertEqual(1, len(statements))
+		self.assertTrue(statements.pop().endswith('%s)'))  # no semicolon, so the connector rewrites each batch
+		self.connection.commit.assert_called_once_with()
+
+	def test_export_records_batch_at_limit(self):
+		column_count = len(self.exporter._get_archive_column_list())
+		self._connect(('max_allowed_packet', str(3 * column_count * ESTIMATED_BYTES_PER_VALUE), ))
+
+		self.exporter.export_records([self._get_record(minute) for minute in range(5, 35, 5)])
+
+		self.assertEqual([3, 3], [len(c[0][1]) for c in self.cursor.executemany.call_args_list])
+		self.connection.commit.assert_called_once_with()
+
+	def test_export_records_empty(self):
+		self._connect(None)
+
+		self.exporter.export_records([])
+
+		self.assertFalse(self.cursor.executemany.called)
+		self.assertFalse(self.connection.commit.called)
+
+	def test_fixed_time_zone_inside_daylight_saving_time(self):
+		time_zone = self.exporter._get_fixed_time_zone(datetime(2016, 7, 1, 0, 5), datetime(2016, 8, 1, 0, 0))
+		self.assertEqual(pytz.FixedOffset(-300), time_zone)
+
+	def test_fixed_time_zone_inside_standard_time(self):
+		time_zone = self.exporter._get_fixed_time_zone(datetime(2016, 1, 1, 0, 5), datetime(2016, 2, 1, 0, 0))
+		self.assertEqual(pytz.FixedOffset(-360), time_zone)
+
+	def test_fixed_time_zone_across_transition(self):
+		self.assertIsNone(self.exporter._get_fixed_time_zone(datetime(2016, 3, 1, 0, 5), datetime(2016, 4, 1, 0, 0)))
+		self.assertIsNone(self.exporter._get_fixed_time_zone(datetime(2016, 11, 1, 0, 5), datetime(2016, 12, 1, 0, 0)))
+
+	def test_fixed_time_zone_across_two_transitions(self):
+		# The offsets at both ends match, but daylight saving time starts and ends in between
+		self.assertIsNone(self.exporter._get_fixed_time_zone(datetime(2016, 1, 1, 0, 5), datetime(2016, 12, 31, 0, 0)))
+
+	def test_export_records_unsorted_across_transition(self):
+		self._connect(None)
+
+		self.exporter.export_records([
+			self._get_record(0, datetime(2016, 3, 1, 12, 0)),
+			self._get_record(0, datetime(2016, 3, 20, 12, 0)),
+			self._get_record(0, datetime(2016, 3, 2, 12, 0)),
+		])
+
+		self.assertEqual(
+			[datetime(2016, 3, 1, 18, 0), datetime(2016, 3, 20, 17, 0), datetime(2016, 3, 2, 18, 0)],
+			[row['timestamp_utc'] for row in self._get_inserted_rows()],
+		)
+		self.assertIsNone(self.exporter._fixed_time_zone)
+
+	def test_export_records_unsorted_inside_standard_time(self):
+		self._connect(None)
+
+		with mock.patch.object(self.exporter, '_get_fixed_time_zone', wraps=self.exporter._get_fixed_time_zone) as m:
+			self.exporter.export_records([
+				self._get_record(0, datetime(2016, 1, 20, 12, 0)),
+				self._get_record(0, datetime(2016, 1, 1, 12, 0)),
+				self._get_record(0, datetime(2016, 1, 31, 12, 0)),
+			])
+
+		m.assert_called_once_with(datetime(2016, 1, 1, 12, 0), datetime(2016, 1, 31, 12, 0))
+		self.assertEqual(
+			[datetime(2016, 1, 20, 18, 0), datetime(2016, 1, 1, 18, 0), datetime(2016, 1, 31, 18, 0)],
+			[row['timestamp_utc'] for row in self._get_inserted_rows()],
+		)
+
+	def test_export_record_reuses_prepared_statement(self):
+		self.prepared_cursor = _PreparedCursor()
+		self._connect(None)
+
+		for minute in range(5, 20, 5):
+			self.exporter.export_record(self._get_record(minute))
+
+		self.assertEqual(1, self.prepared_cursor.prepare_count)
+		self.assertEqual(3, len(self.prepared_cursor.executed))
+		self.assertEqual(3, self.connection.commit.call_count)
+
+	def test_export_record_inserts_only_present_columns(self):
+		self.prepared_cursor = _PreparedCursor()
+		self._connect(None)
+
+		record = self._get_record(5)
+		del record['temperature_outside']
+		self.exporter.export_record(record)
+
+		statement, arguments = self.prepared_cursor.executed[0]
+		columns = self._get_columns(statement)
+		self.assertNotIn('temperature_outside', columns)
+		self.assertIn('humidity_outside', columns)
+		self.assertNotIn(None, arguments)  # absent values are left to the column defaults rather than sent as NULL
+		self.assertEqual(len(columns), len(arguments))
+
+	def test_export_records_groups_rows_by_columns(self):
+		self._connect(None)
+
+		records = [self._get_record(minute) for minute in range(5, 25, 5)]
+		del records[2]['temperature_outside']
+		self.exporter.export_records(records)
+
+		calls = self.cursor.executemany.call_args_list
+		self.assertEqual([3, 1], [len(c[0][1]) for c in calls])
+		self.assertEqual(
+			[True, True, True, False],
+			['temperature_outside' in row for row in self._get_inserted_rows()],
+		)
+		self.connection.commit.assert_called_once_with()
+
+	def test_export_records_interleaved_columns(self):
+		column_count = len(self.exporter._get_archive_column_list())
+		self._connect(('max_allowed_packet', str(3 * column_count * ESTIMATED_BYTES_PER_VALUE), ))
+
+		# Three column sets, switching on every record: complete, without an outside temperature, and without a
+		# barometric pressure, four records each
+		records = [self._get_record(minute) for minute in range(0, 60, 5)]
+		for i, record in enumerate(records):
+			if i % 3 == 1:
+				del record['temperature_outside']
+			elif i % 3 == 2:
+				del record['barometric_pressure']
+		self.exporter.export_records(records)
+
+		# One statement per column set, each split only by the batch size of three, rather than one call per record
+		calls = self.cursor.executemany.call_args_list
+		self.assertEqual([3, 1, 3, 1, 3, 1], [len(c[0][1]) for c in calls])
+		statements = [c[0][0] for c in calls]
+		self.assertEqual(3, len(set(statements)))
+		for statement in statements:
+			self.assertIs(statement, self.exporter._get_archive_insert_statement(tuple(self._get_columns(statement))))
+		self.assertEqual(
+			list(range(0, 60, 5)),
+			sorted(row['timestamp_utc'].minute for row in self._get_inserted_rows()),
+		)
+		self.connection.commit.assert_called_once_with()
+
+
+class TestMySQLExporterSampleDatabase(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		directory = tempfile.mkdtemp()
+		try:
+			file_name = os.path.join(directory, '2016-04.wlk')
+			with bz2.BZ2File(
+				os.path.join(
+					os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+					'data/sample-database-2016-04.wlk.bz2',
+				),
+				'rb',
+			) as source, open(file_name, 'wb') as destination:
+				shutil.copyfileobj(source, destination)
+
+			importer = Importer(file_name)
+			importer.import_data()
+			cls.records = importer.records
+		finally:
+			shutil.rmtree(directory)
+
+	def test_export_records_month(self):
+		exporter = MySQLExporter('weather', 'secret', 'weather')
+		cursor = mock.MagicMock()
+		cursor.fetchone.return_value = None
+		connection = mock.MagicMock()
+		connection.cursor.return_value = cursor
+		with mock.patch('mysql.connector.connect', return_value=connection):
+			exporter.connect()
+		cursor.reset_mock()
+
+		exporter.export_records(self.records)
+
+		# The records of a real month flip between their column sets from one interval to the next, but each column
+		# set still fits in one batch at the default packet size, so there is one call per distinct statement
+		calls = cursor.executemany.call_args_list
+		statements = set(c[0][0] for c in calls)
+		self.assertGreater(len(statements), 1)
+		self.assertEqual(len(statements), len(calls))
+		self.assertEqual(len(self.records), sum(len(c[0][1]) for c in calls))
+		connection.commit.assert_called_once_with()
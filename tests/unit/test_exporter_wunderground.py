@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+
+from datetime import datetime
+import mock
+from unittest import TestCase
+
+from weatherlink.exporter.mysql import MySQLExporter
+from weatherlink.exporter.wunderground import WundergroundExporter
+from weatherlink.models import RecordDict
+
+
+class TestWundergroundExporter(TestCase):
+	def setUp(self):
+		self.exporter = WundergroundExporter('KILCHICA1', 'secret')
+		self.exporter._session = mock.MagicMock()
+		self.exporter._session.get.return_value.status_code = 200
+		self.exporter._session.get.return_value.text = 'success'
+
+	def _get_date_utc(self, date):
+		self.exporter._send_update('https://example.com/update?action=updateraw', (), (), RecordDict({'date': date}))
+		url = self.exporter._session.get.call_args[0][0]
+		return url.split('&dateutc=', 1)[1].split('&', 1)[0]
+
+	def test_date_utc_standard_time(self):
+		self.assertEqual('2016-01-15%2018%3A00%3A00', self._get_date_utc(datetime(2016, 1, 15, 12, 0)))
+
+	def test_date_utc_daylight_saving_time(self):
+		self.assertEqual('2016-07-15%2017%3A00%3A00', self._get_date_utc(datetime(2016, 7, 15, 12, 0)))
+
+	def test_date_utc_matches_mysql_exporter(self):
+		mysql_exporter = MySQLExporter('weather', 'secret', 'weather')
+		for date in (datetime(2016, 1, 15, 12, 0), datetime(2016, 7, 15, 12, 0)):
+			arguments = {}
+			mysql_exporter._add_timestamp_values_to_arguments(RecordDict({'date': date}), arguments)
+			self.assertEqual(
+				arguments['timestamp_utc'].strftime('%Y-%m-%d%%20%H%%3A%M%%3A%S'),
+				self._get_date_utc(date),
+			)
@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+
+import bz2
+import datetime
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from weatherlink.importer import Importer
+from weatherlink.models import (
+	RainCollectorTypeDatabase,
+	WindDirection,
+)
+
+
+class TestImporter(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.directory = tempfile.mkdtemp()
+		cls.file_name = os.path.join(cls.directory, '2016-04.wlk')
+
+		with bz2.BZ2File(
+			os.path.join(
+				os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+				'data/sample-database-2016-04.wlk.bz2',
+			),
+			'rb',
+		) as source, open(cls.file_name, 'wb') as destination:
+			shutil.copyfileobj(source, destination)
+
+	@classmethod
+	def tearDownClass(cls):
+		shutil.rmtree(cls.directory)
+
+	def test_file_name(self):
+		importer = Importer(self.file_name)
+		self.assertEqual(2016, importer.year)
+		self.assertEqual(4, importer.month)
+
+		for file_name in ('', '2016-04.txt', '16-04.wlk', '/path/to/April.wlk'):
+			with self.assertRaises(ValueError):
+				Importer(file_name)
+
+	def test_import_data(self):
+		importer = Importer(self.file_name)
+		importer.import_data()
+
+		self.assertEqual(7180, importer.header.record_count)
+		self.assertEqual(25, len(importer.daily_summaries))
+		self.assertEqual(7130, len(importer.records))
+		self.assertEqual(
+			len(importer.records),
+			sum(len(records) for records in importer.daily_records.values()),
+		)
+
+		for day, day_index in enumerate(importer.header.day_indexes):
+			if day > 0 and day_index.record_count > 1:
+				self.assertEqual(day_index.record_count - 2, len(importer.daily_records[day]))
+
+		summary = importer.daily_summaries[1]
+		self.assertEqual(datetime.date(2016, 4, 1), summary.date)
+		self.assertEqual(1420, summary.minutes)
+		self.assertEqual(Decimal('68.1'), summary.temperature_outside_high)
+		self.assertEqual(Decimal('50.7'), summary.temperature_outside_low)
+		self.assertEqual(Decimal('29.788'), summary.barometric_pressure_average)
+		self.assertIsNone(summary.wind_speed_high_10_minute_average)
+		self.assertEqual(WindDirection.NNE, summary.wind_speed_high_direction)
+		self.assertEqual(Decimal('0.010'), summary.rain_total)
+
+		record = importer.daily_records[1][0]
+		self.assertEqual(datetime.datetime(2016, 4, 1, 0, 5), record.date)
+		self.assertEqual(545325061, record.timestamp)
+		self.assertEqual(5, record.minutes_covered)
+		self.assertEqual(Decimal('63.2'), record.temperature_outside)
+		self.assertEqual(Decimal('29.642'), record.barometric_pressure)
+		self.assertEqual(Decimal('96.0'), record.humidity_outside)
+		self.assertEqual(WindDirection.W, record.wind_direction_prevailing)
+		self.assertEqual(270.0, record.wind_direction_prevailing_degrees)
+		self.assertEqual(RainCollectorTypeDatabase.inches_0_01, record.rain_collector_type)
+		self.assertEqual(Decimal('0.00'), record.rain_amount)
+		self.assertIsNone(record.solar_radiation)
+		self.assertIsNone(record.uv_index)
+
+		record = importer.records[-1]
+		self.assertEqual(datetime.datetime(2016, 4, 25, 18, 45), record.date)
+		self.assertEqual(Decimal('77.8'), record.temperature_outside)
+		self.assertEqual(WindDirection.SSW, record.wind_direction_prevailing)
+		self.assertEqual(WindDirection.SSE, record.wind_direction_speed_high)
+
+	def test_get_daily_summary_columns(self):
+		importer = Importer(self.file_name)
+		importer.import_data()
+
+		columns = importer.get_daily_summary_columns()
+
+		days = sorted(importer.daily_summaries)
+		self.assertEqual([importer.daily_summaries[day].date for day in days], columns['date'])
+		self.assertEqual(25, len(columns['temperature_outside_high']))
+		self.assertEqual(Decimal('68.1'), columns['temperature_outside_high'][0])
+		self.assertEqual(Decimal('50.7'), columns['temperature_outside_low'][0])
+		self.assertEqual(set(importer.daily_summaries[1]), set(columns))
+
+		importer.daily_summaries = {}
+		self.assertEqual([], importer.get_daily_summary_columns()['rain_total'])
+
+	def test_import_record_columns(self):
+		importer = Importer(self.file_name)
+		columns = importer.import_record_columns()
+		self.assertIsNone(importer.records)
+
+		importer.import_data()
+		self.assertEqual(set(importer.records[0]), set(columns))
+		for name, column in columns.items():
+			self.assertEqual([record[name] for record in importer.records], column)
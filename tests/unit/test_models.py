@@ -1,23 +1,41 @@
 from __future__ import absolute_import
 
+import array
 import curses.ascii
 from datetime import (
 	datetime,
 	timedelta,
 )
 from decimal import Decimal
+import io
+import mmap
 import os
 import struct
+import tempfile
 from unittest import TestCase
 
 from weatherlink.models import (
+	calculate_weatherlink_crc,
 	convert_datetime_to_timestamp,
 	convert_timestamp_to_datetime,
+	DASH_LARGE,
+	DASH_SMALL,
+	DASH_ZERO,
+	HUNDREDTHS,
+	TENTHS,
+	THOUSANDTHS,
+	ArchiveIntervalRecord,
 	BarometricTrend,
+	DailySummary,
+	DayIndex,
+	Header,
 	LoopRecord,
 	RainCollectorTypeSerial,
 	RainCollectorTypeDatabase,
+	RecordDict,
 	WindDirection,
+	WEATHERLINK_CRC_TABLE,
+	WIND_DIRECTION_FROM_CODE,
 )
 
 
@@ -123,6 +141,14 @@ class TestBarometricTrend(TestCase):
 
 
 class TestWindDirection(TestCase):
+	def test_from_code(self):
+		for direction in WindDirection:
+			self.assertIs(direction, WIND_DIRECTION_FROM_CODE(direction.value))
+
+		for code in (-1, 16, 255):
+			with self.assertRaises(ValueError):
+				WIND_DIRECTION_FROM_CODE(code)
+
 	def test_expected_values(self):
 		self.assertEqual(WindDirection.N, WindDirection(0))
 		self.assertEqual(WindDirection.NNE, WindDirection(1))
@@ -252,6 +278,15 @@ class TestRainCollectorTypeSerial(TestCase):
 		self.assertEqual(Decimal('0.02'), RainCollectorTypeSerial.millimeters_0_2.clicks_to_centimeters(1))
 		self.assertEqual(Decimal('1.40'), RainCollectorTypeSerial.millimeters_0_2.clicks_to_centimeters(70))
 
+	def test_inches_per_click(self):
+		for collector_type in RainCollectorTypeSerial:
+			for clicks in (0, 1, 70, 4095):
+				self.assertEqual(
+					collector_type.clicks_to_inches(clicks),
+					clicks * collector_type.inches_per_click,
+					(collector_type, clicks),
+				)
+
 
 class TestRainCollectorTypeDatabase(TestCase):
 	def inches_0_1(self):
@@ -339,12 +374,395 @@ class TestRainCollectorTypeDatabase(TestCase):
 		self.assertEqual(Decimal('0.1'), RainCollectorTypeDatabase.millimeters_1_0.clicks_to_centimeters(1))
 		self.assertEqual(Decimal('7.0'), RainCollectorTypeDatabase.millimeters_1_0.clicks_to_centimeters(70))
 
+	def test_inches_per_click(self):
+		for collector_type in RainCollectorTypeDatabase:
+			for clicks in (0, 1, 70, 4095):
+				self.assertEqual(
+					collector_type.clicks_to_inches(clicks),
+					clicks * collector_type.inches_per_click,
+					(collector_type, clicks),
+				)
+
+
+class TestRecordDict(TestCase):
+	def test_attribute_access(self):
+		record = ArchiveIntervalRecord(temperature_outside=Decimal('72.1'))
+		record.rain_amount = Decimal('0.01')
+
+		self.assertEqual(Decimal('72.1'), record.temperature_outside)
+		self.assertEqual(Decimal('0.01'), record['rain_amount'])
+		self.assertEqual({'temperature_outside': Decimal('72.1'), 'rain_amount': Decimal('0.01')}, record)
+
+		with self.assertRaises(KeyError):
+			record.temperature_inside
+
+	def test_no_instance_dict(self):
+		for cls in (RecordDict, Header, DayIndex, DailySummary, ArchiveIntervalRecord, LoopRecord):
+			self.assertEqual((), cls.__slots__, cls)
+			self.assertFalse('__dict__' in dir(cls), cls)
+
+
+class TestArchiveIntervalRecord(TestCase):
+	@staticmethod
+	def _get_record_buffer(minutes_past_midnight, rain_code=0x1000, rain_rate_clicks=0):
+		values = [0] * len(ArchiveIntervalRecord.RECORD_ATTRIBUTE_MAP_WLK)
+		values[0] = 1
+		values[1] = 5
+		values[2] = minutes_past_midnight
+		values[10] = rain_code
+		values[11] = rain_rate_clicks
+		return ArchiveIntervalRecord.RECORD_STRUCT_WLK.pack(*values)
+
+	def test_rain_collector_type(self):
+		for collector_type in RainCollectorTypeDatabase:
+			record = ArchiveIntervalRecord.load_from_wlk_buffer(
+				self._get_record_buffer(5, collector_type.value | 3),
+				0,
+				2016,
+				4,
+				1,
+			)
+			self.assertEqual(collector_type, record.rain_collector_type)
+			self.assertEqual(3, record.rain_amount_clicks)
+			self.assertEqual(collector_type.clicks_to_inches(3), record.rain_amount)
+
+		with self.assertRaises(ValueError):
+			ArchiveIntervalRecord.load_from_wlk_buffer(self._get_record_buffer(5, 0x4003), 0, 2016, 4, 1)
+
+	def test_rain_rate(self):
+		for rain_code, rain_rate_clicks, rain_rate in (
+			(0x1003, 12, Decimal('0.12')),
+			(0x0003, 12, Decimal('1.2')),
+			(0x1003, 0, Decimal('0.00')),
+			(0x1003, 12, Decimal('0.12')),
+		):
+			record = ArchiveIntervalRecord.load_from_wlk_buffer(
+				self._get_record_buffer(5, rain_code, rain_rate_clicks),
+				0,
+				2016,
+				4,
+				1,
+			)
+			self.assertEqual(3, record.rain_amount_clicks)
+			self.assertEqual(rain_rate_clicks, record.rain_rate_clicks)
+			self.assertEqual(rain_rate, record.rain_rate)
+
+	def test_date_and_timestamp(self):
+		record = ArchiveIntervalRecord.load_from_wlk_buffer(self._get_record_buffer(5), 0, 2016, 4, 1)
+		self.assertEqual(datetime(2016, 4, 1, 0, 5), record.date)
+		self.assertEqual(convert_datetime_to_timestamp(record.date), record.timestamp)
+
+		record = ArchiveIntervalRecord.load_from_wlk_buffer(self._get_record_buffer(1439), 0, 2016, 4, 1)
+		self.assertEqual(datetime(2016, 4, 1, 23, 59), record.date)
+		self.assertEqual(convert_datetime_to_timestamp(record.date), record.timestamp)
+
+		record = ArchiveIntervalRecord.load_from_wlk_buffer(self._get_record_buffer(-5), 0, 2016, 4, 1)
+		self.assertEqual(datetime(2016, 3, 31, 23, 55), record.date)
+		self.assertEqual(convert_datetime_to_timestamp(record.date), record.timestamp)
+
+	def test_date_and_timestamp_end_of_day(self):
+		records = ArchiveIntervalRecord.load_many_from_wlk_buffer(
+			self._get_record_buffer(1435) + self._get_record_buffer(1440),
+			0,
+			2,
+			2016,
+			12,
+			31,
+		)
+
+		self.assertEqual(datetime(2016, 12, 31, 23, 55), records[0].date)
+		self.assertEqual(convert_datetime_to_timestamp(records[0].date), records[0].timestamp)
+		self.assertEqual(datetime(2017, 1, 1, 0, 0), records[1].date)
+		self.assertEqual(convert_datetime_to_timestamp(datetime(2017, 1, 1, 0, 0)), records[1].timestamp)
+
+	def test_load_columns_from_wlk_buffer(self):
+		data = b''.join(
+			self._get_record_buffer(minutes, rain_code, rain_rate_clicks)
+			for minutes, rain_code, rain_rate_clicks in ((1430, 0x1000, 0), (1435, 0x3002, 7), (1440, 0x1001, 7))
+		)
+		records = ArchiveIntervalRecord.load_many_from_wlk_buffer(data, 0, 3, 2016, 12, 31)
+		columns = ArchiveIntervalRecord.load_columns_from_wlk_buffer(data, 0, 3, 2016, 12, 31)
+
+		self.assertEqual(set(records[0]), set(columns))
+		for name, column in columns.items():
+			self.assertEqual([record[name] for record in records], column)
+
+		columns = ArchiveIntervalRecord.load_columns_from_wlk_buffer(data, 0, 0, 2016, 12, 31)
+		self.assertEqual(set(records[0]), set(columns))
+		self.assertEqual([], columns['temperature_outside'])
+
+	def test_load_from_download(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-download.bin'),
+			'rb',
+		) as handle:
+			data = handle.read()
+
+		record = ArchiveIntervalRecord.load_from_download(io.BytesIO(data), 5)
+		self.assertEqual(record, ArchiveIntervalRecord.load_from_download_buffer(data, 0, 5))
+		self.assertEqual(datetime(2016, 4, 25, 5, 5), record.date)
+		self.assertEqual(546898425, record.timestamp)
+		self.assertEqual(5, record.minutes_covered)
+		self.assertEqual(Decimal('55.1'), record.temperature_outside)
+		self.assertEqual(Decimal('29.928'), record.barometric_pressure)
+		self.assertEqual(WindDirection.SE, record.wind_direction_prevailing)
+		self.assertEqual(135.0, record.wind_direction_prevailing_degrees)
+		self.assertEqual(RainCollectorTypeSerial.inches_0_01, record.rain_collector_type)
+		self.assertEqual(Decimal('0.00'), record.rain_amount)
+		self.assertIsNone(record.uv_index)
+
+		record = ArchiveIntervalRecord.load_from_download_buffer(data, 161 * ArchiveIntervalRecord.RECORD_LENGTH_DOWNLOAD, 5)
+		self.assertEqual(datetime(2016, 4, 25, 18, 45), record.date)
+
+		# The download is padded out with blank records, which are skipped
+		self.assertIsNone(
+			ArchiveIntervalRecord.load_from_download_buffer(data, 162 * ArchiveIntervalRecord.RECORD_LENGTH_DOWNLOAD, 5)
+		)
+
+
+class TestRecordVerification(TestCase):
+	def test_daily_summary_verification(self):
+		with self.assertRaises(AssertionError):
+			DailySummary.load_from_wlk_buffer(b'\x00' * DailySummary.DAILY_SUMMARY_LENGTH, 0, 2016, 4, 1)
+
+	def test_download_record_verification(self):
+		values = [0] * len(ArchiveIntervalRecord.RECORD_ATTRIBUTE_MAP_DOWNLOAD)
+		values[0] = 1
+		values[-1] = 1
+		with self.assertRaises(AssertionError):
+			ArchiveIntervalRecord.load_from_download_buffer(ArchiveIntervalRecord.RECORD_STRUCT_DOWNLOAD.pack(*values), 0, 5)
+
+	def test_archive_interval_record_columns_verification(self):
+		with self.assertRaises(AssertionError):
+			ArchiveIntervalRecord.load_columns_from_wlk_buffer(
+				b'\x00' * ArchiveIntervalRecord.RECORD_LENGTH_WLK,
+				0,
+				1,
+				2016,
+				4,
+				1,
+			)
+
+	def test_archive_interval_record_verification(self):
+		with self.assertRaises(AssertionError):
+			ArchiveIntervalRecord.load_from_wlk_buffer(b'\x00' * ArchiveIntervalRecord.RECORD_LENGTH_WLK, 0, 2016, 4, 1)
+
+
+class TestCalculateWeatherLinkCrc(TestCase):
+	def test_known_values(self):
+		self.assertEqual(0, calculate_weatherlink_crc(b''))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc(b'123456789'))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc(bytearray(b'123456789')))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc(memoryview(b'0123456789')[1:]))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc(array.array('B', b'123456789')))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc(u'123456789'))
+		self.assertEqual(0x31C3, calculate_weatherlink_crc([ord(c) for c in '123456789']))
+
+	def test_table_matches_native(self):
+		# Starting from zero, the CRC of a single byte is that byte's table entry
+		for byte in range(256):
+			self.assertEqual(WEATHERLINK_CRC_TABLE[byte], calculate_weatherlink_crc(bytearray([byte])))
+			self.assertEqual(WEATHERLINK_CRC_TABLE[byte], calculate_weatherlink_crc([byte]))
+
+	def test_not_bytes(self):
+		with self.assertRaises(ValueError):
+			calculate_weatherlink_crc([0x100])
+		with self.assertRaises(ValueError):
+			calculate_weatherlink_crc(u'\u0100')
+
+	def test_text_with_high_bytes(self):
+		self.assertEqual(
+			calculate_weatherlink_crc(b'\x06\x10\xff\x80'),
+			calculate_weatherlink_crc(u'\x06\x10\xff\x80'),
+		)
+
+	def test_memory_mapped_file(self):
+		with tempfile.TemporaryFile() as handle:
+			handle.write(b'0123456789')
+			handle.flush()
+			data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				self.assertEqual(0x9C58, calculate_weatherlink_crc(data))
+				self.assertEqual(0x31C3, calculate_weatherlink_crc(memoryview(data)[1:]))
+			finally:
+				data.close()
+
+	def test_running_crc(self):
+		crc = 0
+		for piece in (b'123', bytearray(b'45'), u'6', [ord('7')], memoryview(b'89')):
+			crc = calculate_weatherlink_crc(piece, crc)
+		self.assertEqual(0x31C3, crc)
+
+	def test_data_with_crc_appended(self):
+		data = b'\x06\x10\x4a\x01\xff\x7f\x00'
+		data += struct.pack('>H', calculate_weatherlink_crc(data))
+		self.assertEqual(0, calculate_weatherlink_crc(data))
+
+
+class TestCompiledFieldDecoder(TestCase):
+	def test_dash_values_are_inlined(self):
+		code = LoopRecord.LOOP2_RECORD_FIELD_DECODER.__code__
+		for dash in (DASH_LARGE, DASH_SMALL, DASH_ZERO):
+			self.assertIn(dash, code.co_consts)
+		self.assertEqual([], [name for name in code.co_names if name.startswith('DASH_')])
+
+	def test_scaling_converters(self):
+		self.assertEqual(Decimal('-12.3'), TENTHS(-123))
+		self.assertEqual(Decimal('1.23'), HUNDREDTHS(123))
+		self.assertEqual(Decimal('29.921'), THOUSANDTHS(29921))
+		with self.assertRaises(TypeError):
+			TENTHS(12.3)
+
+	def test_dash_values_decode_to_none(self):
+		conversions = LoopRecord.LOOP2_RECORD_FIELD_CONVERSIONS
+		unpacked = [0] * len(LoopRecord.LOOP2_RECORD_DATA_ATTRIBUTE_MAP)
+		for i, _, _, dash in conversions:
+			if dash is not None:
+				unpacked[i] = dash
+
+		decoded = LoopRecord.LOOP2_RECORD_FIELD_DECODER(tuple(unpacked))
+		self.assertEqual(set(name for _, name, _, _ in conversions), set(decoded))
+		for _, name, _, dash in conversions:
+			if dash is None:
+				self.assertEqual(0, decoded[name])
+			else:
+				self.assertIsNone(decoded[name])
+
+	def test_scaled_values_are_shared(self):
+		decode = ArchiveIntervalRecord.RECORD_FIELD_DECODER_WLK
+		unpacked = [0] * len(ArchiveIntervalRecord.RECORD_ATTRIBUTE_MAP_WLK)
+		unpacked[0] = 1  # the verified record version
+		unpacked[3] = 635  # outside temperature
+		unpacked[4] = 701  # high outside temperature
+		unpacked[5] = DASH_LARGE  # low outside temperature
+
+		first = decode(tuple(unpacked))
+		second = decode(tuple(unpacked))
+		self.assertEqual(Decimal('63.5'), first['temperature_outside'])
+		self.assertEqual(Decimal('70.1'), first['temperature_outside_high'])
+		self.assertIsNone(first['temperature_outside_low'])
+		self.assertIs(first['temperature_outside'], second['temperature_outside'])
+
+		unpacked[3] = DASH_LARGE  # a dash for this field, but a reading for the high temperature
+		unpacked[4] = DASH_LARGE
+		third = decode(tuple(unpacked))
+		self.assertIsNone(third['temperature_outside'])
+		self.assertEqual(Decimal('3276.7'), third['temperature_outside_high'])
+
+	def test_wind_direction_lookups(self):
+		decode = ArchiveIntervalRecord.RECORD_FIELD_DECODER_WLK
+		unpacked = [0] * len(ArchiveIntervalRecord.RECORD_ATTRIBUTE_MAP_WLK)
+		unpacked[0] = 1  # the verified record version
+		unpacked[14] = WindDirection.SSW.value
+		unpacked[15] = DASH_SMALL
+		decoded = decode(tuple(unpacked))
+		self.assertIs(WindDirection.SSW, decoded['wind_direction_prevailing'])
+		self.assertEqual(202.5, decoded['wind_direction_prevailing_degrees'])
+		self.assertIsNone(decoded['wind_direction_speed_high'])
+		self.assertIsNone(decoded['wind_direction_speed_high_degrees'])
+
+		unpacked[14] = WindDirection.N.value
+		self.assertEqual(360.0, decode(tuple(unpacked))['wind_direction_prevailing_degrees'])
+
+		unpacked[15] = 16
+		with self.assertRaises(ValueError):
+			decode(tuple(unpacked))
+
+		unpacked[15] = DASH_SMALL
+		unpacked[14] = 16
+		with self.assertRaises(ValueError):
+			decode(tuple(unpacked))
+
 
 class TestLoopRecord(TestCase):
 	def test_load_loop_1_from_connection_not_implemented(self):
 		with self.assertRaises(NotImplementedError):
 			LoopRecord.load_loop_1_from_connection(None)
 
+	def test_loop_2_structs_unpack_subsets(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			handle.read(6)
+			data = handle.read(LoopRecord.RECORD_LENGTH)
+
+		unpacked = LoopRecord.LOOP2_RECORD_STRUCT.unpack(data)
+		for subset_struct, indexes in (
+			(LoopRecord.LOOP2_RECORD_DATA_STRUCT, LoopRecord.LOOP2_RECORD_DATA_INDEXES),
+			(LoopRecord.LOOP2_RECORD_VERIFICATION_STRUCT, sorted(LoopRecord.LOOP2_RECORD_VERIFICATION_MAP_WLK)),
+		):
+			self.assertEqual(LoopRecord.RECORD_LENGTH, subset_struct.size)
+			self.assertEqual(tuple(unpacked[i] for i in indexes), subset_struct.unpack(data))
+
+	def test_load_loop_2_verification(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			handle.read(6)
+			data = bytearray(handle.read(LoopRecord.RECORD_LENGTH))
+
+		data[5] = 0x00  # the first 0x7FFF padding field
+		with self.assertRaises(AssertionError):
+			LoopRecord.load_loop_2_from_connection(io.BytesIO(bytes(data)))
+
+		data[5] = 0xFF
+		data[0] = ord(b'X')  # the 'LOO' marker
+		with self.assertRaises(AssertionError):
+			LoopRecord.load_loop_2_from_connection(io.BytesIO(bytes(data)))
+
+		data[0] = ord(b'L')
+		self.assertEqual(2, LoopRecord.load_loop_2_from_connection(io.BytesIO(bytes(data))).record_type)
+
+	def test_load_loop_2_unknown_barometric_trend(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			handle.read(6)
+			data = bytearray(handle.read(LoopRecord.RECORD_LENGTH))
+
+		for trend in (5, 80):
+			data[3] = trend
+			record = LoopRecord.load_loop_2_from_buffer(data)
+			self.assertFalse(record.crc_match)
+			self.assertIsNone(record.barometric_trend)
+
+	def test_load_many_loop_2_from_buffer(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			data = handle.read()
+
+		records = LoopRecord.load_many_loop_2_from_buffer(data, 6, 15)
+		self.assertEqual(15, len(records))
+
+		handle = io.BytesIO(data)
+		handle.read(6)
+		for record in records:
+			self.assertTrue(record.crc_match)
+			self.assertEqual(LoopRecord.load_loop_2_from_connection(handle), record)
+
+		self.assertEqual(records[2], LoopRecord.load_loop_2_from_buffer(data, 6 + (2 * LoopRecord.RECORD_LENGTH)))
+
+	def test_load_loop_2_from_connection_into_buffer(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			data = handle.read()
+
+		handle = io.BytesIO(data)
+		handle.read(6)
+		buffer = bytearray(LoopRecord.RECORD_LENGTH)
+		records = [LoopRecord.load_loop_2_from_connection(handle, buffer) for _ in range(0, 15)]
+		self.assertEqual(LoopRecord.load_many_loop_2_from_buffer(data, 6, 15), records)
+
+		with self.assertRaises(IOError):
+			LoopRecord.load_loop_2_from_connection(handle, buffer)
+
 	def test_load_loop_2_from_connection(self):
 		with open(
 			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
@@ -1 +1,65 @@
 from __future__ import absolute_import
+
+import contextlib
+import io
+import mock
+import os
+from unittest import TestCase
+
+from weatherlink.models import LoopRecord
+from weatherlink.poller import (
+	IPPoller,
+	LoopPacketReader,
+)
+
+
+class TestIPPoller(TestCase):
+	def setUp(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			self.data = handle.read()
+
+		self.poller = IPPoller('localhost')
+
+	@contextlib.contextmanager
+	def _get_file_handle(self):
+		yield io.BufferedReader(io.BytesIO(self.data[6:]))
+
+	@mock.patch('weatherlink.poller.IPPoller._send_instruction')
+	def test_poll(self, mock_send_instruction):
+		self.assertEqual(IPPoller.PACKET_TYPE_LOOP2, self.poller.packet_type)
+
+		with mock.patch.object(self.poller, '_get_file_handle', self._get_file_handle):
+			packets = self.poller.poll(15)
+
+		mock_send_instruction.assert_called_once_with('LPS 2 15\n')
+		self.assertEqual(LoopRecord.load_many_loop_2_from_buffer(self.data, 6, 15), packets)
+
+	@mock.patch('weatherlink.poller.IPPoller._send_instruction')
+	def test_poll_loop_1(self, _):
+		self.poller.packet_type = IPPoller.PACKET_TYPE_LOOP1
+
+		with mock.patch.object(self.poller, '_get_file_handle', self._get_file_handle):
+			with self.assertRaises(NotImplementedError):
+				self.poller.poll(1)
+
+
+class TestLoopPacketReader(TestCase):
+	def test_feed(self):
+		with open(
+			os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'data/sample-loop2-data.bin'),
+			'rb',
+		) as handle:
+			data = handle.read()[6:6 + (15 * LoopRecord.RECORD_LENGTH)]
+
+		reader = LoopPacketReader()
+		packets = []
+		for i in range(0, len(data), 40):
+			packets.extend(reader.feed(data[i:i + 40]))
+
+		self.assertEqual(LoopRecord.load_many_loop_2_from_buffer(data, 0, 15), packets)
+		self.assertEqual([], reader.feed(b''))
+		self.assertEqual([], reader.feed(data[:LoopRecord.RECORD_LENGTH - 1]))
+		self.assertEqual(1, len(reader.feed(data[LoopRecord.RECORD_LENGTH - 1:LoopRecord.RECORD_LENGTH + 1])))
@@ -164,6 +164,44 @@ class TestSerialCommunicator(TestCase):
 class TestSerialIPCommunicator(TestCase):
 	def setUp(self):
 		self.communicator = SerialIPCommunicator('127.0.0.1', 0)  # TODO
+		self.communicator._socket = mock.MagicMock()
+
+	def test_send_data_text(self):
+		self.communicator._send_data(u'LPS 2 15\n')
+		self.communicator._socket.sendall.assert_called_once_with(b'LPS 2 15\n')
+
+	def test_send_data_bytes(self):
+		self.communicator._send_data(b'\x00\x01\xff')
+		self.communicator._socket.sendall.assert_called_once_with(b'\x00\x01\xff')
+
+	def _recv_into(self, *chunks):
+		chunks = list(chunks)
+
+		def recv_into(view):
+			chunk = chunks.pop(0)
+			view[:len(chunk)] = chunk
+			return len(chunk)
+		return recv_into
+
+	def test_read_data(self):
+		self.communicator._socket.recv_into.side_effect = self._recv_into(b'\x06\x06')
+		self.assertEqual(b'\x06\x06', self.communicator._read_data(2))
+		self.assertEqual(1, self.communicator._socket.recv_into.call_count)
+
+	def test_read_data_partial(self):
+		self.communicator._socket.recv_into.side_effect = self._recv_into(b'\x01', b'\x02\x03', b'\x04')
+		self.assertEqual(b'\x01\x02\x03\x04', self.communicator._read_data(4))
+		self.assertEqual(3, self.communicator._socket.recv_into.call_count)
+
+	def test_read_data_connection_closed(self):
+		self.communicator._socket.recv_into.side_effect = self._recv_into(b'\x01', b'')
+		with self.assertRaises(IOError):
+			self.communicator._read_data(2)
+
+	def test_get_file_handle_is_binary(self):
+		with self.communicator._get_file_handle():
+			pass
+		self.communicator._socket.makefile.assert_called_once_with('rb')
 
 
 class TestConfigurationSettingMixin(TestCase):
@@ -246,6 +284,23 @@ class TestConfigurationSettingMixin(TestCase):
 		mock_get_file_handle.return_value.__enter__.return_value.read.assert_called_once_with(3)
 		self.assertFalse(mock_crc.called)
 
+	@mock.patch('weatherlink.serial.ConfigurationSettingMixin._send_data')
+	@mock.patch('weatherlink.serial.ConfigurationSettingMixin._send_instruction')
+	def test_write_config_setting(self, mock_send_instruction, mock_send_data):
+		self.communicator.write_config_setting('3C', '02', b'\xFF\xE3')
+
+		mock_send_instruction.assert_called_once_with('EEBWR 3C 02\n')
+		mock_send_data.assert_called_once_with(b'\xFF\xE3\xCE\xB2')  # the CRC is appended big-endian
+
+	@mock.patch('weatherlink.serial.ConfigurationSettingMixin._send_data')
+	@mock.patch('weatherlink.serial.ConfigurationSettingMixin._send_instruction')
+	def test_write_config_setting_wrong_length(self, mock_send_instruction, mock_send_data):
+		with self.assertRaises(ValueError):
+			self.communicator.write_config_setting('3C', '03', b'\xFF\xE3')
+
+		self.assertFalse(mock_send_instruction.called)
+		self.assertFalse(mock_send_data.called)
+
 	@mock.patch('weatherlink.serial.ConfigurationSettingMixin.read_config_setting')
 	def test_read_setup_bit(self, mock_read_config_setting):
 		mock_read_config_setting.return_value = six.int2byte(0b10101110)
@@ -1,6 +1,10 @@
 from __future__ import absolute_import
 
-from datetime import datetime
+from datetime import (
+	datetime,
+	timedelta,
+	tzinfo,
+)
 from decimal import Decimal
 import imp
 import os
@@ -9,6 +13,8 @@ from unittest import (
 	TestCase
 )
 
+import pytz
+
 from weatherlink import utils
 
 
@@ -482,3 +488,94 @@ class TestHighTenMinuteWindAverageCalculation(TestCase):
 		self.assertEqual('NNW', direction)
 		self.assertEqual(start, datetime(2016, 4, 29, 6, 39))
 		self.assertEqual(end, datetime(2016, 4, 29, 6, 48))
+
+
+class TestAllRecordValuesCalculation(TestCase):
+	RECORD = {
+		'minutes_covered': 5,
+		'temperature_outside': Decimal('82.1'),
+		'temperature_outside_low': Decimal('81.9'),
+		'temperature_outside_high': Decimal('82.1'),
+		'temperature_inside': Decimal('72.0'),
+		'humidity_outside': Decimal('55'),
+		'humidity_inside': Decimal('40'),
+		'barometric_pressure': Decimal('29.921'),
+		'wind_speed': Decimal('3.0'),
+		'wind_speed_high': Decimal('8.0'),
+		'solar_radiation': None,
+		'solar_radiation_high': None,
+	}
+
+	def test_calculate_all_record_values(self):
+		values = utils.calculate_all_record_values(self.RECORD)
+
+		self.assertEqual(Decimal('0.25'), values['wind_run_distance_total'])
+		self.assertEqual(utils.calculate_dew_point(Decimal('82.1'), Decimal('55')), values['dew_point_outside'])
+		self.assertEqual(utils.calculate_dew_point(Decimal('81.9'), Decimal('55')), values['dew_point_outside_low'])
+		self.assertEqual(values['dew_point_outside'], values['dew_point_outside_high'])
+		self.assertEqual(utils.calculate_heat_index(Decimal('82.1'), Decimal('55')), values['heat_index_outside'])
+		self.assertEqual(
+			utils.calculate_wet_bulb_temperature(Decimal('82.1'), Decimal('55'), Decimal('29.921')),
+			values['temperature_wet_bulb'],
+		)
+		self.assertNotIn('thsw_index', values)
+
+	def test_calculate_all_record_values_with_shared_cache(self):
+		cache = {}
+
+		self.assertEqual(
+			utils.calculate_all_record_values(self.RECORD),
+			utils.calculate_all_record_values(self.RECORD, cache),
+		)
+		self.assertTrue(cache)
+
+		size = len(cache)
+		self.assertEqual(
+			utils.calculate_all_record_values(self.RECORD),
+			utils.calculate_all_record_values(self.RECORD, cache),
+		)
+		self.assertEqual(size, len(cache))
+
+	def test_calculate_all_record_values_cache_is_exact(self):
+		cache = {}
+		utils.calculate_all_record_values(self.RECORD, cache)
+		for key in cache:
+			cache[key] = 'cached'  # any result shared with the equal but differently scaled inputs below would show
+
+		record = dict(
+			self.RECORD,
+			temperature_outside=Decimal('82.10'),
+			temperature_outside_low=Decimal('81.90'),
+			temperature_outside_high=Decimal('82.10'),
+			temperature_inside=Decimal('72'),
+		)
+		values = utils.calculate_all_record_values(record, cache)
+
+		self.assertNotIn('cached', values.values())
+		self.assertEqual(utils.calculate_all_record_values(record), values)
+
+
+class TestLocalizeStationDatetime(TestCase):
+	def test_pytz_time_zone(self):
+		time_zone = pytz.timezone('America/Chicago')
+
+		d = utils.localize_station_datetime(datetime(2016, 1, 15, 12, 0), time_zone)
+		self.assertEqual(datetime(2016, 1, 15, 18, 0), d.astimezone(pytz.UTC).replace(tzinfo=None))
+
+		d = utils.localize_station_datetime(datetime(2016, 7, 15, 12, 0), time_zone)
+		self.assertEqual(datetime(2016, 7, 15, 17, 0), d.astimezone(pytz.UTC).replace(tzinfo=None))
+
+	def test_fixed_offset(self):
+		d = utils.localize_station_datetime(datetime(2016, 7, 15, 12, 0), pytz.FixedOffset(-300))
+		self.assertEqual(datetime(2016, 7, 15, 17, 0), d.astimezone(pytz.UTC).replace(tzinfo=None))
+
+	def test_other_tzinfo(self):
+		class _Offset(tzinfo):
+			def utcoffset(self, dt):
+				return timedelta(hours=-6)
+
+			def dst(self, dt):
+				return timedelta(0)
+
+		d = utils.localize_station_datetime(datetime(2016, 1, 15, 12, 0), _Offset())
+		self.assertEqual(datetime(2016, 1, 15, 18, 0), d.astimezone(pytz.UTC).replace(tzinfo=None))
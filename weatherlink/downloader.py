@@ -1,4 +1,4 @@
-from __future__ import absolute_import
+from __future__ import absolute_import, print_function
 
 import requests
 
@@ -18,7 +18,7 @@ class Downloader(object):
 	)
 	ACTION_HEADERS = 'headers'
 	ACTION_DOWNLOAD = 'data'
-	ARCHIVE_RECORD_LENGTH = 52
+	ARCHIVE_RECORD_LENGTH = ArchiveIntervalRecord.RECORD_LENGTH_DOWNLOAD  # 52 bytes, from the precompiled struct
 
 	def __init__(self, username, password, api_token):
 		if not (username and password and api_token):
@@ -93,8 +93,12 @@ class Downloader(object):
 	def _process_download(self, download_response_handle):
 		self.records = []
 
+		# All the records are read in one go and decoded in place, rather than with one small read per record
+		record_length = self.ARCHIVE_RECORD_LENGTH
+		data = download_response_handle.read(self.record_count * record_length)
+
 		for i in range(0, self.record_count):
-			record = ArchiveIntervalRecord.load_from_download(download_response_handle, self.record_minute_span)
+			record = ArchiveIntervalRecord.load_from_download_buffer(data, i * record_length, self.record_minute_span)
 			if not record:
 				print('WARN: Halted at record %s because false-y' % i)
 				break
@@ -6,9 +6,11 @@ can be used to calculate daily, weekly, monthly, yearly, and all-time summaries,
 
 from __future__ import absolute_import
 
+import collections
 import contextlib
 import decimal
 import datetime
+import logging
 
 import mysql.connector
 import mysql.connector.errors
@@ -18,11 +20,19 @@ import six
 import weatherlink.utils
 
 
+logger = logging.getLogger(__name__)
+
 COLUMN_MAP_DO_NOT_INSERT = '__do_not_insert_this_value__'
 
 THREE_HOURS_IN_SECONDS = 10800
+ONE_DAY = datetime.timedelta(days=1)
 HUNDREDTHS = decimal.Decimal('0.01')
 
+# The MySQL server default, used until the real value can be read from the server after connecting
+DEFAULT_MAX_ALLOWED_PACKET = 4194304
+# A generous estimate of the bytes each value contributes to a multi-row INSERT statement, used to size batches
+ESTIMATED_BYTES_PER_VALUE = 32
+
 
 class MySQLExporter(object):
 	DEFAULT_ARCHIVE_TABLE_NAME = 'weather_archive_record'
@@ -120,8 +130,14 @@ class MySQLExporter(object):
 		self._archive_table_name = self.DEFAULT_ARCHIVE_TABLE_NAME
 		self._archive_table_column_map = self.DEFAULT_ARCHIVE_TABLE_COLUMN_MAP
 		self._station_time_zone = self.DEFAULT_TIME_ZONE
+		self._fixed_time_zone = None
+		self._calculation_cache = None
+
+		self._archive_insert_statements = {}
 
 		self._connection = None
+		self._prepared_cursor = None
+		self._max_allowed_packet = DEFAULT_MAX_ALLOWED_PACKET
 
 	@property
 	def archive_table_name(self):
@@ -156,12 +172,34 @@ class MySQLExporter(object):
 			password=self.password,
 		)
 
+		# Batched inserts are split so that no single rewritten multi-row INSERT exceeds the server's packet limit
+		self._max_allowed_packet = DEFAULT_MAX_ALLOWED_PACKET
+		with self._get_cursor("SHOW VARIABLES LIKE 'max_allowed_packet';") as cursor:
+			result = cursor.fetchone()
+			if result:
+				self._max_allowed_packet = int(result[1])
+
+		logger.debug(
+			'Batched exports will insert up to %s records per multi-row INSERT (max_allowed_packet is %s bytes%s).',
+			self._get_batch_size(len(self._get_archive_column_list())),
+			self._max_allowed_packet,
+			'' if result else ', the server default, because the server did not report it',
+		)
+
+		# Single-record inserts reuse one server-side prepared statement instead of sending the SQL text every time
+		self._prepared_cursor = self._connection.cursor(prepared=True)
+
 	def disconnect(self):
 		if self._connection:
 			try:
-				self._connection.close()
+				if self._prepared_cursor:
+					self._prepared_cursor.close()
 			finally:
-				self._connection = None
+				self._prepared_cursor = None
+				try:
+					self._connection.close()
+				finally:
+					self._connection = None
 
 	def __enter__(self):
 		self.connect()
@@ -200,31 +238,114 @@ class MySQLExporter(object):
 						raise
 
 	def export_record(self, record):
+		columns, arguments = self._get_archive_columns_and_arguments(record, self._get_archive_column_list())
+
+		# The same statement object is passed for every record with the same columns, because the prepared cursor only
+		# reuses its server-side prepared statement when it is given the identical statement again
+		self._prepared_cursor.execute(self._get_archive_insert_statement(columns), arguments)
+		self._connection.commit()
+
+	def export_records(self, records):
+		column_list = self._get_archive_column_list()
+		batch_size = self._get_batch_size(len(column_list))
+
+		records = list(records)
+		if not records:
+			return
+
+		# Most exports (one .wlk file is one month) never cross a DST transition, so a fixed offset can be used
+		dates = [record.date for record in records]
+		self._fixed_time_zone = self._get_fixed_time_zone(min(dates), max(dates))
+		# Derived values are cached across the whole batch, because conditions repeat often from record to record
+		self._calculation_cache = {}
+
+		try:
+			# One multi-row INSERT can only hold records with the same columns, and records switch between a handful of
+			# column sets constantly (a value is missing here and there), so records are grouped by their columns
+			# rather than batched in record order; all groups are inserted in the same transaction
+			rows_by_columns = collections.OrderedDict()
+			for record in records:
+				columns, arguments = self._get_archive_columns_and_arguments(record, column_list)
+				rows = rows_by_columns.get(columns)
+				if rows is None:
+					rows = rows_by_columns[columns] = []
+				rows.append(arguments)
+
+			with self._get_cursor() as cursor:
+				for columns, rows in rows_by_columns.items():
+					statement = self._get_archive_insert_statement(columns)
+					for start in range(0, len(rows), batch_size):
+						cursor.executemany(statement, rows[start:start + batch_size])
+
+				self._connection.commit()
+		finally:
+			self._fixed_time_zone = None
+			self._calculation_cache = None
+
+	def _get_archive_columns_and_arguments(self, record, column_list):
+		# Only the columns the record has values for are inserted, so that every other column gets its table default
+		argument_map = self._get_archive_argument_map(record)
+		columns = tuple(column for column in column_list if column in argument_map)
+		return columns, tuple(argument_map[column] for column in columns)
+
+	def _get_archive_column_list(self):
+		column_list = []
+		for column in self.archive_table_column_map.values():
+			if column != COLUMN_MAP_DO_NOT_INSERT and column not in column_list:
+				column_list.append(column)
+		return column_list
+
+	def _get_batch_size(self, column_count):
+		return max(1, self._max_allowed_packet // (column_count * ESTIMATED_BYTES_PER_VALUE))
+
+	def _get_archive_insert_statement(self, columns):
+		# The statement must end with the VALUES clause and no semicolon so that the connector's executemany rewrites
+		# each batch into a single multi-row INSERT instead of sending one INSERT per record. Each statement is built
+		# once and the same object returned after that, so the prepared cursor can recognize and reuse it.
+		key = (self.archive_table_name, columns)
+		statement = self._archive_insert_statements.get(key)
+		if statement is None:
+			statement = self._archive_insert_statements[key] = 'INSERT INTO {} ({}) VALUES ({})'.format(
+				self.archive_table_name,
+				', '.join(columns),
+				', '.join(['%s'] * len(columns)),
+			)
+		return statement
+
+	def _get_fixed_time_zone(self, first_date, last_date):
+		# Returns a fixed offset that gives the same results as the station time zone for every date from first_date to
+		# last_date (inclusive), or None if the station time zone's UTC offset changes anywhere in that span
+		time_zone = self.station_time_zone
+
+		try:
+			offset = time_zone.utcoffset(first_date)
+			if offset is None:
+				return None
+
+			# Equal offsets at both ends are not enough if a pair of transitions lies between the two dates, so the
+			# offset is checked every day in between (daylight saving time never starts and ends within one day)
+			date = first_date
+			while date < last_date:
+				date = min(date + ONE_DAY, last_date)
+				if time_zone.utcoffset(date) != offset:
+					return None
+		except pytz.exceptions.InvalidTimeError:
+			return None  # an ambiguous or non-existent local time can only occur at a transition
+
+		return pytz.FixedOffset(int(offset.total_seconds()) // 60)
+
+	def _get_archive_argument_map(self, record):
 		argument_map = {}
 		self._add_timestamp_values_to_arguments(record, argument_map)
 		self._add_physical_values_to_arguments(record, argument_map)
 		self._add_calculated_values_to_arguments(record, argument_map)
-
-		column_list = []
-		arguments = []
-		for k, v in six.iteritems(argument_map):
-			if k != COLUMN_MAP_DO_NOT_INSERT:
-				column_list.append(k)
-				arguments.append(v)
-
-		statement = (
-			'INSERT INTO ' + self.archive_table_name + ' (' + ', '.join(column_list) + ') ' +
-			'VALUES (' + ', '.join(['%s'] * len(column_list)) + ');'
-		)
-
-		with self._get_cursor(statement, arguments):
-			self._connection.commit()
+		return argument_map
 
 	def _add_timestamp_values_to_arguments(self, record, arguments):
 		column_map = self.archive_table_column_map
 
-		d = record.date.replace(tzinfo=self.station_time_zone).astimezone(pytz.UTC).replace(tzinfo=None)
-		arguments[column_map['timestamp_utc']] = d
+		d = weatherlink.utils.localize_station_datetime(record.date, self._fixed_time_zone or self.station_time_zone)
+		arguments[column_map['timestamp_utc']] = d.astimezone(pytz.UTC).replace(tzinfo=None)
 		arguments[column_map['summary_year']] = record.date.year
 		arguments[column_map['summary_month']] = record.date.month
 		arguments[column_map['summary_day']] = record.date.day
@@ -243,7 +364,7 @@ class MySQLExporter(object):
 	def _add_calculated_values_to_arguments(self, record, arguments):
 		column_map = self.archive_table_column_map
 
-		for k, v in six.iteritems(weatherlink.utils.calculate_all_record_values(record)):
+		for k, v in weatherlink.utils.calculate_all_record_values(record, self._calculation_cache).items():
 			if k in column_map:
 				arguments[column_map[k]] = v
 
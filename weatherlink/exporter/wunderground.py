@@ -131,7 +131,8 @@ class WundergroundExporter(object):
 		self._station_time_zone = pytz.timezone(value) if isinstance(value, six.string_types) else value
 
 	def _send_update(self, url, attribute_map, attribute_calculations, record):
-		d = record.date.replace(tzinfo=self.station_time_zone).astimezone(pytz.UTC).replace(tzinfo=None)
+		d = weatherlink.utils.localize_station_datetime(record.date, self.station_time_zone)
+		d = d.astimezone(pytz.UTC).replace(tzinfo=None)
 
 		url = '%s&ID=%s&PASSWORD=%s&dateutc=%s' % (
 			url,
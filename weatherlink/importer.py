@@ -1,6 +1,10 @@
 from __future__ import absolute_import
 
 import collections
+import mmap
+import operator
+import os
+import re
 
 from weatherlink.models import (
 	Header,
@@ -11,22 +15,20 @@ from weatherlink.models import (
 
 class Importer(object):
 	FILE_EXTENSION = '.wlk'
-	FILE_EXTENSION_LENGTH = len(FILE_EXTENSION)
-	EXPECTED_FILE_NAME_LENGTH = 7
+	FILE_NAME_PATTERN = re.compile(r'(\d{4})-(\d{2})' + re.escape(FILE_EXTENSION) + r'\Z')
 
 	def __init__(self, file_name):
 		if not file_name:
 			raise ValueError('file_name')
-		if file_name[-self.FILE_EXTENSION_LENGTH:] != self.FILE_EXTENSION:
+
+		match = self.FILE_NAME_PATTERN.search(os.path.basename(file_name))
+		if not match:
 			raise ValueError('file_name')
 
 		self.file_name = file_name
 
-		start_index = -(self.FILE_EXTENSION_LENGTH + self.EXPECTED_FILE_NAME_LENGTH)
-		year, month = file_name[start_index:][:self.EXPECTED_FILE_NAME_LENGTH].split('-')
-
-		self.year = int(year)
-		self.month = int(month)
+		self.year = int(match.group(1))
+		self.month = int(match.group(2))
 
 		self.header = None
 		self.daily_summaries = None
@@ -34,23 +36,83 @@ class Importer(object):
 		self.daily_records = None
 
 	def import_data(self):
+		# The file is memory-mapped and parsed at offsets, rather than read with thousands of tiny reads or copied
 		with open(self.file_name, 'rb') as file_handle:
-			self.header = Header.load_from_wlk(file_handle)
-			self.daily_summaries = {}
-			self.records = []
-			self.daily_records = collections.defaultdict(list)
-
-			for day, day_index in enumerate(self.header.day_indexes):
-				if day > 0:
-					for r in range(0, day_index.record_count - 1):
-						if r == 0:
-							self.daily_summaries[day] = DailySummary.load_from_wlk(
-								file_handle,
-								self.year,
-								self.month,
-								day,
-							)
-						else:
-							record = ArchiveIntervalRecord.load_from_wlk(file_handle, self.year, self.month, day)
-							self.records.append(record)
-							self.daily_records[day].append(record)
+			data = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				self._import_buffer(data)
+			finally:
+				data.close()
+
+	def _import_buffer(self, data):
+		self.header = Header.load_from_wlk_buffer(data)
+		self.daily_summaries = {}
+		self.records = []
+		self.daily_records = collections.defaultdict(list)
+
+		for day, day_index in enumerate(self.header.day_indexes):
+			# Each day with data starts with a daily summary (which occupies two record slots), then archive records
+			if day > 0 and day_index.record_count > 1:
+				self.daily_summaries[day], records = self._load_day(data, day, day_index)
+				self.records.extend(records)
+				self.daily_records[day].extend(records)
+
+	def _load_day(self, data, day, day_index):
+		# A day's block depends only on its own day index entry, so this touches no importer state beyond the file's year
+		# and month; the results are assembled in day order by the caller
+		offset = self._get_day_offset(day_index)
+		summary = DailySummary.load_from_wlk_buffer(data, offset, self.year, self.month, day)
+		records = ArchiveIntervalRecord.load_many_from_wlk_buffer(
+			data,
+			offset + DailySummary.DAILY_SUMMARY_LENGTH,
+			day_index.record_count - 2,
+			self.year,
+			self.month,
+			day,
+		)
+		return summary, records
+
+	@staticmethod
+	def _get_day_offset(day_index):
+		return Header.HEADER_LENGTH + (day_index.start_index * ArchiveIntervalRecord.RECORD_LENGTH_WLK)
+
+	def import_record_columns(self):
+		# Decodes every archive record in the file, to the same values as import_data, straight into one list per
+		# attribute (in the same order as `records`), without building the records, for callers that only aggregate
+		# whole columns. The importer's own state is left untouched.
+		with open(self.file_name, 'rb') as file_handle:
+			data = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+			try:
+				return self._import_record_columns(data)
+			finally:
+				data.close()
+
+	def _import_record_columns(self, data):
+		header = Header.load_from_wlk_buffer(data)
+		columns = ArchiveIntervalRecord.load_columns_from_wlk_buffer(data, 0, 0, self.year, self.month, 1)  # all empty
+
+		for day, day_index in enumerate(header.day_indexes):
+			if day > 0 and day_index.record_count > 1:
+				day_columns = ArchiveIntervalRecord.load_columns_from_wlk_buffer(
+					data,
+					self._get_day_offset(day_index) + DailySummary.DAILY_SUMMARY_LENGTH,
+					day_index.record_count - 2,
+					self.year,
+					self.month,
+					day,
+				)
+				for name, column in day_columns.items():
+					columns[name].extend(column)
+
+		return columns
+
+	def get_daily_summary_columns(self):
+		# Transposes the daily summaries into one list per attribute (including `date`), in day order, for callers that
+		# aggregate whole columns (averages, extremes, totals) rather than walking the summaries one at a time
+		names = ('date', ) + tuple(name for _, name, _, _ in DailySummary.DAILY_SUMMARY_FIELD_CONVERSIONS)
+		get_row = operator.itemgetter(*names)
+		rows = [get_row(self.daily_summaries[day]) for day in sorted(self.daily_summaries)]
+
+		if not rows:
+			return {name: [] for name in names}
+		return {name: list(column) for name, column in zip(names, zip(*rows))}
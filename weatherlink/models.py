@@ -7,11 +7,15 @@ The data formats in this file were obtained from Davis WeatherLink documentation
 	- C:/WeatherLink/Readme 6.0.rtf
 """
 
-from __future__ import absolute_import
+from __future__ import absolute_import, print_function
 
+import binascii
 import datetime
 import decimal
 import enum
+import functools
+import operator
+import re
 import struct
 
 import six
@@ -26,35 +30,84 @@ STRAIGHT_NUMBER = int
 
 STRAIGHT_DECIMAL = decimal.Decimal
 
+# The scaling converters are partial applications of the C multiply, rather than lambdas, so that calling one (outside
+# of the generated decoders, which multiply inline) costs no Python frame
 _TENTHS = decimal.Decimal('0.1')
-TENTHS = lambda x: x * _TENTHS
+TENTHS = functools.partial(operator.mul, _TENTHS)
 
 _HUNDREDTHS = decimal.Decimal('0.01')
-HUNDREDTHS = lambda x: x * _HUNDREDTHS
+HUNDREDTHS = functools.partial(operator.mul, _HUNDREDTHS)
 
 _THOUSANDTHS = decimal.Decimal('0.001')
-THOUSANDTHS = lambda x: x * _THOUSANDTHS
+THOUSANDTHS = functools.partial(operator.mul, _THOUSANDTHS)
+
+# The exact Decimal scale behind each scaling converter, so that generated decoders can scale values without a call
+_CONVERTER_SCALES = {TENTHS: _TENTHS, HUNDREDTHS: _HUNDREDTHS, THOUSANDTHS: _THOUSANDTHS}
+
+
+class _ScaledDecimals(dict):
+	# Memoizes the Decimal product of a scale and each unpacked value it has seen, computing it on the first miss.
+	# Readings repeat the same few hundred values of a 16-bit field, so nearly every lookup is a hit, which costs a
+	# fraction of a Decimal multiply. Decimals are immutable, so one result is safely shared by every record. The field's
+	# dash value, if any, is stored as None, so the same lookup replaces the dash comparison as well.
+	__slots__ = ('scale', )
+
+	def __init__(self, scale, dash=None):
+		super(_ScaledDecimals, self).__init__()
+		self.scale = scale
+		if dash is not None:
+			self[dash] = None
+
+	def __missing__(self, value):
+		scaled = self[value] = value * self.scale
+		return scaled
+
+
+_SCALED_DECIMALS = {}
+
+
+def _get_scaled_decimals(scale, dash):
+	# Fields with the same scale and dash value share one memo
+	key = (scale, dash)
+	if key not in _SCALED_DECIMALS:
+		_SCALED_DECIMALS[key] = _ScaledDecimals(scale, dash)
+	return _SCALED_DECIMALS[key]
+
 
 _INCHES_PER_CENTIMETER = decimal.Decimal('0.393701')
 
+# Inches per click for the metric rain collectors, folded into one exact constant so each conversion is one multiply
+_INCHES_PER_0_1_MILLIMETER = _HUNDREDTHS * _INCHES_PER_CENTIMETER
+_INCHES_PER_0_2_MILLIMETER = _HUNDREDTHS * _INCHES_PER_CENTIMETER * 2
+_INCHES_PER_1_0_MILLIMETER = _TENTHS * _INCHES_PER_CENTIMETER
+
+# Likewise for centimeters per click; dividing by these exact constants gives results identical to the two-step form
+_TENTHS_OF_AN_INCH_PER_CENTIMETER = _INCHES_PER_CENTIMETER / _TENTHS
+_HUNDREDTHS_OF_AN_INCH_PER_CENTIMETER = _INCHES_PER_CENTIMETER / _HUNDREDTHS
+_CENTIMETERS_PER_0_2_MILLIMETER = _HUNDREDTHS * 2
+
 
 def convert_datetime_to_timestamp(d):
 	if isinstance(d, datetime.datetime):
-		return ((d.day + (d.month * 32) + ((d.year - 2000) * 512)) << 16) + (d.minute + (d.hour * 100))
+		return ((((d.year - 2000) << 9) | (d.month << 5) | d.day) << 16) + (d.minute + (d.hour * 100))
 	return d
 
 
 def convert_timestamp_to_datetime(timestamp):
-	date_part = timestamp >> 16
-	time_part = timestamp - (date_part << 16)
+	# Integer-only arithmetic: the date is packed as day + (month * 32) + ((year - 2000) * 512) in the high 16 bits,
+	# which are just bit fields (7 bits of year, 4 of month and 5 of day), and the time as minute + (hour * 100) in the
+	# low 16 bits
+	packed_date = timestamp >> 16
+	hour, minute = divmod(timestamp & 0xFFFF, 100)
+
+	return datetime.datetime((packed_date >> 9) + 2000, (packed_date >> 5) & 0xF, packed_date & 0x1F, hour, minute)
 
-	year = int((date_part / 512) + 2000)
-	month = int((date_part - ((year - 2000) * 512)) / 32)
-	day = int(date_part - ((year - 2000) * 512) - (month * 32))
-	hour = int(time_part / 100)
-	minute = int(time_part - (hour * 100))
 
-	return datetime.datetime(year, month, day, hour, minute)
+# For each minute of a day: a shared timedelta from midnight and the packed time (minute + (hour * 100)) of timestamps
+_MINUTE_OF_DAY_OFFSETS = tuple(
+	(datetime.timedelta(minutes=minute_of_day), ((minute_of_day // 60) * 100) + (minute_of_day % 60))
+	for minute_of_day in range(1440)
+)
 
 
 @enum.unique
@@ -94,25 +147,35 @@ class WindDirection(enum.Enum):
 	def from_degrees(degrees):
 		if degrees < 1 or degrees > 360:
 			return None
-		return _WindDirection__FROM_DEGREE_MAP[degrees]
-_WindDirection__FROM_DEGREE_MAP = {
-	350: WindDirection.N, 351: WindDirection.N, 352: WindDirection.N, 353: WindDirection.N, 354: WindDirection.N, 355: WindDirection.N, 356: WindDirection.N, 357: WindDirection.N, 358: WindDirection.N, 359: WindDirection.N, 360: WindDirection.N, 1: WindDirection.N, 2: WindDirection.N, 3: WindDirection.N, 4: WindDirection.N, 5: WindDirection.N, 6: WindDirection.N, 7: WindDirection.N, 8: WindDirection.N, 9: WindDirection.N, 10: WindDirection.N, 11: WindDirection.N,  # noqa
-	12: WindDirection.NNE, 13: WindDirection.NNE, 14: WindDirection.NNE, 15: WindDirection.NNE, 16: WindDirection.NNE, 17: WindDirection.NNE, 18: WindDirection.NNE, 19: WindDirection.NNE, 20: WindDirection.NNE, 21: WindDirection.NNE, 22: WindDirection.NNE, 23: WindDirection.NNE, 24: WindDirection.NNE, 25: WindDirection.NNE, 26: WindDirection.NNE, 27: WindDirection.NNE, 28: WindDirection.NNE, 29: WindDirection.NNE, 30: WindDirection.NNE, 31: WindDirection.NNE, 32: WindDirection.NNE, 33: WindDirection.NNE, 34: WindDirection.NNE,  # noqa
-	35: WindDirection.NE, 36: WindDirection.NE, 37: WindDirection.NE, 38: WindDirection.NE, 39: WindDirection.NE, 40: WindDirection.NE, 41: WindDirection.NE, 42: WindDirection.NE, 43: WindDirection.NE, 44: WindDirection.NE, 45: WindDirection.NE, 46: WindDirection.NE, 47: WindDirection.NE, 48: WindDirection.NE, 49: WindDirection.NE, 50: WindDirection.NE, 51: WindDirection.NE, 52: WindDirection.NE, 53: WindDirection.NE, 54: WindDirection.NE, 55: WindDirection.NE, 56: WindDirection.NE,  # noqa
-	57: WindDirection.ENE, 58: WindDirection.ENE, 59: WindDirection.ENE, 60: WindDirection.ENE, 61: WindDirection.ENE, 62: WindDirection.ENE, 63: WindDirection.ENE, 64: WindDirection.ENE, 65: WindDirection.ENE, 66: WindDirection.ENE, 67: WindDirection.ENE, 68: WindDirection.ENE, 69: WindDirection.ENE, 70: WindDirection.ENE, 71: WindDirection.ENE, 72: WindDirection.ENE, 73: WindDirection.ENE, 74: WindDirection.ENE, 75: WindDirection.ENE, 76: WindDirection.ENE, 77: WindDirection.ENE, 78: WindDirection.ENE, 79: WindDirection.ENE,  # noqa
-	80: WindDirection.E, 81: WindDirection.E, 82: WindDirection.E, 83: WindDirection.E, 84: WindDirection.E, 85: WindDirection.E, 86: WindDirection.E, 87: WindDirection.E, 88: WindDirection.E, 89: WindDirection.E, 90: WindDirection.E, 91: WindDirection.E, 92: WindDirection.E, 93: WindDirection.E, 94: WindDirection.E, 95: WindDirection.E, 96: WindDirection.E, 97: WindDirection.E, 98: WindDirection.E, 99: WindDirection.E, 100: WindDirection.E, 101: WindDirection.E,  # noqa
-	102: WindDirection.ESE, 103: WindDirection.ESE, 104: WindDirection.ESE, 105: WindDirection.ESE, 106: WindDirection.ESE, 107: WindDirection.ESE, 108: WindDirection.ESE, 109: WindDirection.ESE, 110: WindDirection.ESE, 111: WindDirection.ESE, 112: WindDirection.ESE, 113: WindDirection.ESE, 114: WindDirection.ESE, 115: WindDirection.ESE, 116: WindDirection.ESE, 117: WindDirection.ESE, 118: WindDirection.ESE, 119: WindDirection.ESE, 120: WindDirection.ESE, 121: WindDirection.ESE, 122: WindDirection.ESE, 123: WindDirection.ESE, 124: WindDirection.ESE,  # noqa
-	125: WindDirection.SE, 126: WindDirection.SE, 127: WindDirection.SE, 128: WindDirection.SE, 129: WindDirection.SE, 130: WindDirection.SE, 131: WindDirection.SE, 132: WindDirection.SE, 133: WindDirection.SE, 134: WindDirection.SE, 135: WindDirection.SE, 136: WindDirection.SE, 137: WindDirection.SE, 138: WindDirection.SE, 139: WindDirection.SE, 140: WindDirection.SE, 141: WindDirection.SE, 142: WindDirection.SE, 143: WindDirection.SE, 144: WindDirection.SE, 145: WindDirection.SE, 146: WindDirection.SE,  # noqa
-	147: WindDirection.SSE, 148: WindDirection.SSE, 149: WindDirection.SSE, 150: WindDirection.SSE, 151: WindDirection.SSE, 152: WindDirection.SSE, 153: WindDirection.SSE, 154: WindDirection.SSE, 155: WindDirection.SSE, 156: WindDirection.SSE, 157: WindDirection.SSE, 158: WindDirection.SSE, 159: WindDirection.SSE, 160: WindDirection.SSE, 161: WindDirection.SSE, 162: WindDirection.SSE, 163: WindDirection.SSE, 164: WindDirection.SSE, 165: WindDirection.SSE, 166: WindDirection.SSE, 167: WindDirection.SSE, 168: WindDirection.SSE, 169: WindDirection.SSE,  # noqa
-	170: WindDirection.S, 171: WindDirection.S, 172: WindDirection.S, 173: WindDirection.S, 174: WindDirection.S, 175: WindDirection.S, 176: WindDirection.S, 177: WindDirection.S, 178: WindDirection.S, 179: WindDirection.S, 180: WindDirection.S, 181: WindDirection.S, 182: WindDirection.S, 183: WindDirection.S, 184: WindDirection.S, 185: WindDirection.S, 186: WindDirection.S, 187: WindDirection.S, 188: WindDirection.S, 189: WindDirection.S, 190: WindDirection.S, 191: WindDirection.S,  # noqa
-	192: WindDirection.SSW, 193: WindDirection.SSW, 194: WindDirection.SSW, 195: WindDirection.SSW, 196: WindDirection.SSW, 197: WindDirection.SSW, 198: WindDirection.SSW, 199: WindDirection.SSW, 200: WindDirection.SSW, 201: WindDirection.SSW, 202: WindDirection.SSW, 203: WindDirection.SSW, 204: WindDirection.SSW, 205: WindDirection.SSW, 206: WindDirection.SSW, 207: WindDirection.SSW, 208: WindDirection.SSW, 209: WindDirection.SSW, 210: WindDirection.SSW, 211: WindDirection.SSW, 212: WindDirection.SSW, 213: WindDirection.SSW, 214: WindDirection.SSW,  # noqa
-	215: WindDirection.SW, 216: WindDirection.SW, 217: WindDirection.SW, 218: WindDirection.SW, 219: WindDirection.SW, 220: WindDirection.SW, 221: WindDirection.SW, 222: WindDirection.SW, 223: WindDirection.SW, 224: WindDirection.SW, 225: WindDirection.SW, 226: WindDirection.SW, 227: WindDirection.SW, 228: WindDirection.SW, 229: WindDirection.SW, 230: WindDirection.SW, 231: WindDirection.SW, 232: WindDirection.SW, 233: WindDirection.SW, 234: WindDirection.SW, 235: WindDirection.SW, 236: WindDirection.SW,  # noqa
-	237: WindDirection.WSW, 238: WindDirection.WSW, 239: WindDirection.WSW, 240: WindDirection.WSW, 241: WindDirection.WSW, 242: WindDirection.WSW, 243: WindDirection.WSW, 244: WindDirection.WSW, 245: WindDirection.WSW, 246: WindDirection.WSW, 247: WindDirection.WSW, 248: WindDirection.WSW, 249: WindDirection.WSW, 250: WindDirection.WSW, 251: WindDirection.WSW, 252: WindDirection.WSW, 253: WindDirection.WSW, 254: WindDirection.WSW, 255: WindDirection.WSW, 256: WindDirection.WSW, 257: WindDirection.WSW, 258: WindDirection.WSW, 259: WindDirection.WSW,  # noqa
-	260: WindDirection.W, 261: WindDirection.W, 262: WindDirection.W, 263: WindDirection.W, 264: WindDirection.W, 265: WindDirection.W, 266: WindDirection.W, 267: WindDirection.W, 268: WindDirection.W, 269: WindDirection.W, 270: WindDirection.W, 271: WindDirection.W, 272: WindDirection.W, 273: WindDirection.W, 274: WindDirection.W, 275: WindDirection.W, 276: WindDirection.W, 277: WindDirection.W, 278: WindDirection.W, 279: WindDirection.W, 280: WindDirection.W, 281: WindDirection.W,  # noqa
-	282: WindDirection.WNW, 283: WindDirection.WNW, 284: WindDirection.WNW, 285: WindDirection.WNW, 286: WindDirection.WNW, 287: WindDirection.WNW, 288: WindDirection.WNW, 289: WindDirection.WNW, 290: WindDirection.WNW, 291: WindDirection.WNW, 292: WindDirection.WNW, 293: WindDirection.WNW, 294: WindDirection.WNW, 295: WindDirection.WNW, 296: WindDirection.WNW, 297: WindDirection.WNW, 298: WindDirection.WNW, 299: WindDirection.WNW, 300: WindDirection.WNW, 301: WindDirection.WNW, 302: WindDirection.WNW, 303: WindDirection.WNW, 304: WindDirection.WNW,  # noqa
-	305: WindDirection.NW, 306: WindDirection.NW, 307: WindDirection.NW, 308: WindDirection.NW, 309: WindDirection.NW, 310: WindDirection.NW, 311: WindDirection.NW, 312: WindDirection.NW, 313: WindDirection.NW, 314: WindDirection.NW, 315: WindDirection.NW, 316: WindDirection.NW, 317: WindDirection.NW, 318: WindDirection.NW, 319: WindDirection.NW, 320: WindDirection.NW, 321: WindDirection.NW, 322: WindDirection.NW, 323: WindDirection.NW, 324: WindDirection.NW, 325: WindDirection.NW, 326: WindDirection.NW,  # noqa
-	327: WindDirection.NNW, 328: WindDirection.NNW, 329: WindDirection.NNW, 330: WindDirection.NNW, 331: WindDirection.NNW, 332: WindDirection.NNW, 333: WindDirection.NNW, 334: WindDirection.NNW, 335: WindDirection.NNW, 336: WindDirection.NNW, 337: WindDirection.NNW, 338: WindDirection.NNW, 339: WindDirection.NNW, 340: WindDirection.NNW, 341: WindDirection.NNW, 342: WindDirection.NNW, 343: WindDirection.NNW, 344: WindDirection.NNW, 345: WindDirection.NNW, 346: WindDirection.NNW, 347: WindDirection.NNW, 348: WindDirection.NNW, 349: WindDirection.NNW,  # noqa
-}
+		return _WindDirection__FROM_DEGREE_LOOKUP[degrees]
+# Indexed directly by whole degrees, 1 through 360 (0 is not a valid reading). Each direction covers the readings from
+# 10.5 degrees before its heading to just under 12 degrees after it: (degrees + 10.5) // 22.5, in integer arithmetic.
+_WindDirection__FROM_DEGREE_LOOKUP = (None, ) + tuple(
+	WindDirection((((2 * degrees) + 21) // 45) % 16) for degrees in range(1, 361)
+)
+
+
+class _WindDirectionCodes(dict):
+	# A lookup keyed on wind direction codes, which raises the same ValueError as calling the enum class for any code
+	# that is not a direction (only reached on a miss, so valid codes cost a plain dict lookup)
+	__slots__ = ()
+
+	def __missing__(self, code):
+		raise ValueError('{!r} is not a valid WindDirection'.format(code))
+
+
+# Converts the 0-15 direction codes stored in archive records and daily summaries with a single C-level dict lookup,
+# which is several times cheaper than calling the enum class for every value
+_WIND_DIRECTIONS_BY_CODE = _WindDirectionCodes((direction.value, direction) for direction in WindDirection)
+WIND_DIRECTION_FROM_CODE = _WIND_DIRECTIONS_BY_CODE.__getitem__
+# The same codes straight to each direction's degrees, for records that store both
+_WIND_DIRECTION_DEGREES_BY_CODE = _WindDirectionCodes(
+	(direction.value, direction.degrees) for direction in WindDirection
+)
+
+# The table behind each lookup converter, so that generated decoders can index it directly, with the field's dash value
+# added to it as None in place of a separate comparison
+_CONVERTER_LOOKUPS = {WIND_DIRECTION_FROM_CODE: _WIND_DIRECTIONS_BY_CODE}
 
 
 class RainCollectorType(enum.Enum):
@@ -124,11 +187,14 @@ class RainCollectorTypeSerial(RainCollectorType):
 	inches_0_01 = 0x00
 	millimeters_0_2 = 0x10
 	millimeters_0_1 = 0x20
+RainCollectorTypeSerial.inches_0_01.inches_per_click = _HUNDREDTHS
 RainCollectorTypeSerial.inches_0_01.clicks_to_inches = lambda c: c * _HUNDREDTHS
-RainCollectorTypeSerial.inches_0_01.clicks_to_centimeters = lambda c: c / _INCHES_PER_CENTIMETER * _HUNDREDTHS
-RainCollectorTypeSerial.millimeters_0_2.clicks_to_inches = lambda c: c * _HUNDREDTHS * _INCHES_PER_CENTIMETER * 2
-RainCollectorTypeSerial.millimeters_0_2.clicks_to_centimeters = lambda c: c * _HUNDREDTHS * 2
-RainCollectorTypeSerial.millimeters_0_1.clicks_to_inches = lambda c: c * _HUNDREDTHS * _INCHES_PER_CENTIMETER
+RainCollectorTypeSerial.inches_0_01.clicks_to_centimeters = lambda c: c / _HUNDREDTHS_OF_AN_INCH_PER_CENTIMETER
+RainCollectorTypeSerial.millimeters_0_2.inches_per_click = _INCHES_PER_0_2_MILLIMETER
+RainCollectorTypeSerial.millimeters_0_2.clicks_to_inches = lambda c: c * _INCHES_PER_0_2_MILLIMETER
+RainCollectorTypeSerial.millimeters_0_2.clicks_to_centimeters = lambda c: c * _CENTIMETERS_PER_0_2_MILLIMETER
+RainCollectorTypeSerial.millimeters_0_1.inches_per_click = _INCHES_PER_0_1_MILLIMETER
+RainCollectorTypeSerial.millimeters_0_1.clicks_to_inches = lambda c: c * _INCHES_PER_0_1_MILLIMETER
 RainCollectorTypeSerial.millimeters_0_1.clicks_to_centimeters = lambda c: c * _HUNDREDTHS
 
 
@@ -139,73 +205,202 @@ class RainCollectorTypeDatabase(RainCollectorType):
 	millimeters_0_2 = 0x2000
 	millimeters_1_0 = 0x3000
 	millimeters_0_1 = 0x6000
+RainCollectorTypeDatabase.inches_0_1.inches_per_click = _TENTHS
 RainCollectorTypeDatabase.inches_0_1.clicks_to_inches = lambda c: _TENTHS * c
-RainCollectorTypeDatabase.inches_0_1.clicks_to_centimeters = lambda c: c / _INCHES_PER_CENTIMETER * _TENTHS
+RainCollectorTypeDatabase.inches_0_1.clicks_to_centimeters = lambda c: c / _TENTHS_OF_AN_INCH_PER_CENTIMETER
+RainCollectorTypeDatabase.inches_0_01.inches_per_click = _HUNDREDTHS
 RainCollectorTypeDatabase.inches_0_01.clicks_to_inches = lambda c: _HUNDREDTHS * c
-RainCollectorTypeDatabase.inches_0_01.clicks_to_centimeters = lambda c: c / _INCHES_PER_CENTIMETER * _HUNDREDTHS
-RainCollectorTypeDatabase.millimeters_0_2.clicks_to_inches = lambda c: _HUNDREDTHS * _INCHES_PER_CENTIMETER * c * 2
-RainCollectorTypeDatabase.millimeters_0_2.clicks_to_centimeters = lambda c: c * _HUNDREDTHS * 2
-RainCollectorTypeDatabase.millimeters_1_0.clicks_to_inches = lambda c: _TENTHS * _INCHES_PER_CENTIMETER * c
+RainCollectorTypeDatabase.inches_0_01.clicks_to_centimeters = lambda c: c / _HUNDREDTHS_OF_AN_INCH_PER_CENTIMETER
+RainCollectorTypeDatabase.millimeters_0_2.inches_per_click = _INCHES_PER_0_2_MILLIMETER
+RainCollectorTypeDatabase.millimeters_0_2.clicks_to_inches = lambda c: _INCHES_PER_0_2_MILLIMETER * c
+RainCollectorTypeDatabase.millimeters_0_2.clicks_to_centimeters = lambda c: c * _CENTIMETERS_PER_0_2_MILLIMETER
+RainCollectorTypeDatabase.millimeters_1_0.inches_per_click = _INCHES_PER_1_0_MILLIMETER
+RainCollectorTypeDatabase.millimeters_1_0.clicks_to_inches = lambda c: _INCHES_PER_1_0_MILLIMETER * c
 RainCollectorTypeDatabase.millimeters_1_0.clicks_to_centimeters = lambda c: c * _TENTHS
-RainCollectorTypeDatabase.millimeters_0_1.clicks_to_inches = lambda c: _HUNDREDTHS * _INCHES_PER_CENTIMETER * c
+RainCollectorTypeDatabase.millimeters_0_1.inches_per_click = _INCHES_PER_0_1_MILLIMETER
+RainCollectorTypeDatabase.millimeters_0_1.clicks_to_inches = lambda c: _INCHES_PER_0_1_MILLIMETER * c
 RainCollectorTypeDatabase.millimeters_0_1.clicks_to_centimeters = lambda c: c * _HUNDREDTHS
+# Indexed directly by the top four bits of a .wlk archive record's rain code, with None for unassigned values
+_RAIN_COLLECTOR_TYPE_DATABASE_BY_NIBBLE = tuple(
+	{collector_type.value >> 12: collector_type for collector_type in RainCollectorTypeDatabase}.get(nibble)
+	for nibble in range(16)
+)
 
 
-class RecordDict(dict):
-	def __init__(self, *args, **kwargs):
-		super(RecordDict, self).__init__(*args, **kwargs)
+def _get_field_conversions(attribute_map, *skip_maps):
+	# Resolves an attribute map once, at class definition, into (index, name, converter, dash value) tuples for just
+	# the fields that get stored, so loaders need not re-check and re-index the map for every field of every record
+	return tuple(
+		(i, name, converter, dash)
+		for i, (name, converter, dash) in enumerate(attribute_map)
+		if not any(i in skip_map for skip_map in skip_maps)
+	)
 
-	def __getattr__(self, name):
-		return self.__getitem__(name)
 
-	def __setattr__(self, name, value):
-		self[name] = value
+def _get_derived_field_indexes(attribute_map, derived_fields):
+	# Resolves (source name, derived name) pairs against an attribute map into (source index, derived name) pairs, so
+	# that derived values can be computed straight from the unpacked values in the same pass that decodes them
+	indexes = {name: i for i, (name, _, _) in enumerate(attribute_map)}
+	return tuple((indexes[source], derived) for source, derived in derived_fields)
+
+
+def _get_derived_field_lookups(attribute_map, derived_fields, lookup):
+	# Like _get_derived_field_indexes, but for derived values that are a straight lookup of their source's unpacked
+	# value, resolving each pair into (source index, derived name, lookup) with the source's dash value looked up as None
+	derived_lookups = []
+	for i, derived in _get_derived_field_indexes(attribute_map, derived_fields):
+		field_lookup = type(lookup)(lookup)  # keeps how the lookup treats unknown values
+		dash = attribute_map[i][2]
+		if dash is not None:
+			field_lookup[dash] = None
+		derived_lookups.append((i, derived, field_lookup))
+	return tuple(derived_lookups)
+
+
+_STRUCT_FORMAT_CODE = re.compile(r'(\d*)([a-zA-Z?])')
+
+
+def _get_struct_format_subset(struct_format, indexes):
+	# Rewrites a struct format so that it unpacks only the values at the given indexes (counted as the original format
+	# would unpack them), by turning every other value into pad bytes of the same size, so offsets and length are kept
+	byte_order = struct_format[0]
+	subset = [byte_order]
+	i = 0
+	for count, code in _STRUCT_FORMAT_CODE.findall(struct_format[1:]):
+		if code == 'x':
+			subset.append(count + code)
+			continue
+		# A count is a length for strings but a repeat count for everything else
+		codes = [count + code] if code in 'sp' else [code] * int(count or 1)
+		for value_code in codes:
+			subset.append(value_code if i in indexes else '{}x'.format(struct.calcsize(byte_order + value_code)))
+			i += 1
+	return ''.join(subset)
+
+
+def _compile_field_decoder(field_conversions, verification=(), derived_lookups=()):
+	# Generates a function equivalent to looping over field conversions (see _get_field_conversions) but written out as
+	# straight-line code, with every index, name and dash value inlined, for loaders that run once per record. Any
+	# (index, expected value) verification pairs are checked first, likewise inlined, before anything is decoded, and
+	# any derived lookups (see _get_derived_field_lookups) are decoded alongside the fields, into the same dict.
+	namespace = {}
+	checks = [
+		'\tif arguments[{0}] != {1!r}:\n\t\traise AssertionError({2!r}.format(arguments[{0}], {1!r}))\n'.format(
+			i,
+			expected,
+			'{} did not match expected {}',
+		)
+		for i, expected in verification
+	]
+	items = []
+	for i, name, converter, dash in field_conversions:
+		if converter is STRAIGHT_NUMBER:
+			value = 'arguments[{}]'.format(i)  # the unpacked value is already an int
+		elif converter in _CONVERTER_SCALES:
+			namespace['scaled_{}'.format(i)] = _get_scaled_decimals(_CONVERTER_SCALES[converter], dash)
+			dash = None  # already handled by the memo
+			value = 'scaled_{0}[arguments[{0}]]'.format(i)  # the same Decimal the converter returns, minus the multiply
+		elif converter in _CONVERTER_LOOKUPS and dash not in _CONVERTER_LOOKUPS[converter]:
+			table = _CONVERTER_LOOKUPS[converter]
+			lookup = namespace['lookup_{}'.format(i)] = type(table)(table)  # a copy that still rejects unknown codes
+			if dash is not None:
+				lookup[dash] = None
+			dash = None  # already handled by the lookup, and any other unknown code still raises the converter's error
+			value = 'lookup_{0}[arguments[{0}]]'.format(i)
+		else:
+			namespace['convert_{}'.format(i)] = converter
+			value = 'convert_{0}(arguments[{0}])'.format(i)
+		if dash is not None:
+			value = 'None if arguments[{}] == {!r} else {}'.format(i, dash, value)
+		items.append('\t\t{!r}: {},\n'.format(name, value))
+	for j, (i, name, lookup) in enumerate(derived_lookups):
+		namespace['derived_{}'.format(j)] = lookup
+		items.append('\t\t{!r}: derived_{}[arguments[{}]],\n'.format(name, j, i))
+
+	source = 'def decode(arguments):\n' + ''.join(checks) + '\treturn {\n' + ''.join(items) + '\t}\n'
+	exec(compile(source, '<generated field decoder>', 'exec'), namespace)
+	return namespace['decode']
+
+
+def _decode_field_column(values, converter, dash):
+	# The column-wise counterpart of a generated field decoder (see _compile_field_decoder), decoding one field's values
+	# for many records at once. Most columns hold no dash values at all, so for values that need no arithmetic, one
+	# C-level scan for the dash value decides whether the whole column can be copied or mapped in C, with no comparison
+	# per value.
+	if converter is STRAIGHT_NUMBER:
+		if dash is None or dash not in values:
+			return list(values)
+		return [None if value == dash else value for value in values]
+	scale = _CONVERTER_SCALES.get(converter)
+	if scale is not None:
+		# The memo maps dash values to None itself, so every value is one C-level lookup
+		return list(map(_get_scaled_decimals(scale, dash).__getitem__, values))
+	if dash is None or dash not in values:
+		return list(map(converter, values))
+	return [None if value == dash else converter(value) for value in values]
+
+
+class RecordDict(dict):
+	# Records hold all of their values as dict items, so instances need no __dict__ of their own, and attribute access
+	# is bound straight to the dict item methods to avoid an extra Python call for every attribute read and write.
+	# Construction is likewise left to dict itself, so loaders pass their decoded values in as a single mapping.
+	__slots__ = ()
+
+	__getattr__ = dict.__getitem__
+	__setattr__ = dict.__setitem__
 
 
 class Header(RecordDict):
-	VERSION_CODE_AND_COUNT_FORMAT = '=16sl'
-	VERSION_CODE_AND_COUNT_LENGTH = 20
+	__slots__ = ()
+
+	VERSION_CODE_AND_COUNT_FORMAT = '<16sl'
+	DAY_INDEX_COUNT = 32
+	DAY_INDEXES_FORMAT = '<' + ('hl' * DAY_INDEX_COUNT)  # 32 day indexes of 6 bytes each
+	HEADER_STRUCT = struct.Struct(VERSION_CODE_AND_COUNT_FORMAT + DAY_INDEXES_FORMAT[1:])  # the whole header in one go
+	HEADER_LENGTH = HEADER_STRUCT.size
 
 	def __init__(self, version_code, record_count, day_indexes):
-		super(Header, self).__init__()
-		self.version_code = version_code
-		self.record_count = record_count
-		self.day_indexes = day_indexes
+		super(Header, self).__init__(version_code=version_code, record_count=record_count, day_indexes=day_indexes)
 
 	@classmethod
 	def load_from_wlk(cls, file_handle):
-		version_and_count = struct.unpack_from(
-			cls.VERSION_CODE_AND_COUNT_FORMAT,
-			file_handle.read(cls.VERSION_CODE_AND_COUNT_LENGTH),
-		)
-		day_indexes = []
+		return cls.load_from_wlk_buffer(file_handle.read(cls.HEADER_LENGTH))
 
-		for i in range(0, 32):
-			day_indexes.append(DayIndex.load_from_wlk(file_handle))
+	@classmethod
+	def load_from_wlk_buffer(cls, buffer, offset=0):
+		header_values = cls.HEADER_STRUCT.unpack_from(buffer, offset)
+		day_indexes = [
+			DayIndex(record_count, start_index)
+			for record_count, start_index in zip(header_values[2::2], header_values[3::2])
+		]
 
-		return cls(version_and_count[0], version_and_count[1], day_indexes)
+		return cls(header_values[0], header_values[1], day_indexes)
 
 
 class DayIndex(RecordDict):
-	DAY_INDEX_FORMAT = '=hl'
-	DAY_INDEX_LENGTH = 6
+	__slots__ = ()
+
+	DAY_INDEX_FORMAT = '<hl'
+	DAY_INDEX_STRUCT = struct.Struct(DAY_INDEX_FORMAT)
+	DAY_INDEX_LENGTH = DAY_INDEX_STRUCT.size
 
 	def __init__(self, record_count, start_index):
-		super(DayIndex, self).__init__()
-		self.record_count = record_count
-		self.start_index = start_index
+		super(DayIndex, self).__init__(record_count=record_count, start_index=start_index)
 
 	@classmethod
 	def load_from_wlk(cls, file_handle):
-		return cls(*struct.unpack_from(
-			cls.DAY_INDEX_FORMAT,
-			file_handle.read(cls.DAY_INDEX_LENGTH),
-		))
+		return cls.load_from_wlk_buffer(file_handle.read(cls.DAY_INDEX_LENGTH))
+
+	@classmethod
+	def load_from_wlk_buffer(cls, buffer, offset=0):
+		return cls(*cls.DAY_INDEX_STRUCT.unpack_from(buffer, offset))
 
 
 class DailySummary(RecordDict):
+	__slots__ = ()
+
 	DAILY_SUMMARY_FORMAT = (
-		'=bx'  # '2' plus a reserved byte [ignored]
+		'<bx'  # '2' plus a reserved byte [ignored]
 		'h'  # number of minutes accounted for in this day's records
 		'2h'  # hi and low outside temps in tenths of degres
 		'2h'  # hi and low inside temps in tenths of degrees
@@ -224,8 +419,8 @@ class DailySummary(RecordDict):
 		'h'  # average wind speed in tenths of miles per hour
 		'h'  # daily wind run total in tenths of miles
 		'h'  # highest 10-minute average wind speed in tenths of miles per hour
-		'b'  # direction code (0-15, 255) for high wind speed
-		'b'  # direction code for highest 10-minute average wind speed
+		'B'  # direction code (0-15, 255) for high wind speed
+		'B'  # direction code for highest 10-minute average wind speed
 		'h'  # daily rain total in thousandths of inches
 		'h'  # hi daily rain rate in hundredths of inches per hour
 		'2x'  # daily UV dose (ignored)
@@ -247,7 +442,8 @@ class DailySummary(RecordDict):
 		'h'  # integrated cooling degree days in tenths of degrees
 		'11x'  # reserved bytes (ignored)
 	)
-	DAILY_SUMMARY_LENGTH = 88 * 2
+	DAILY_SUMMARY_STRUCT = struct.Struct(DAILY_SUMMARY_FORMAT)
+	DAILY_SUMMARY_LENGTH = DAILY_SUMMARY_STRUCT.size  # two 88-byte record slots
 	DAILY_SUMMARY_VERIFICATION_MAP = {
 		0: 2,
 		30: 3,
@@ -279,8 +475,8 @@ class DailySummary(RecordDict):
 		('wind_speed_average', TENTHS, DASH_ZERO, ),
 		('wind_daily_run', TENTHS, DASH_ZERO, ),
 		('wind_speed_high_10_minute_average', TENTHS, DASH_LARGE_NEGATIVE, ),
-		('wind_speed_high_direction', WindDirection, DASH_SMALL, ),
-		('wind_speed_high_10_minute_average_direction', WindDirection, DASH_SMALL, ),
+		('wind_speed_high_direction', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
+		('wind_speed_high_10_minute_average_direction', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
 		('rain_total', THOUSANDTHS, None, ),
 		('rain_rate_high', HUNDREDTHS, None, ),
 		('ds2_version', STRAIGHT_NUMBER, None, ),
@@ -296,36 +492,28 @@ class DailySummary(RecordDict):
 		('temperature_wet_bulb_average', TENTHS, DASH_LARGE, ),
 		('integrated_cooling_degree_days', TENTHS, DASH_ZERO, ),
 	)
-
-	def __init__(self, *args, **kwargs):
-		super(DailySummary, self).__init__(*args, **kwargs)
+	DAILY_SUMMARY_VERIFICATION = tuple(sorted(DAILY_SUMMARY_VERIFICATION_MAP.items()))
+	DAILY_SUMMARY_FIELD_CONVERSIONS = _get_field_conversions(DAILY_SUMMARY_ATTRIBUTE_MAP, DAILY_SUMMARY_VERIFICATION_MAP)
+	DAILY_SUMMARY_FIELD_DECODER = staticmethod(
+		_compile_field_decoder(DAILY_SUMMARY_FIELD_CONVERSIONS, DAILY_SUMMARY_VERIFICATION),
+	)
 
 	@classmethod
 	def load_from_wlk(cls, file_handle, year, month, day):
-		arguments = struct.unpack_from(
-			cls.DAILY_SUMMARY_FORMAT,
-			file_handle.read(cls.DAILY_SUMMARY_LENGTH),
-		)
-
-		for k, v in six.iteritems(cls.DAILY_SUMMARY_VERIFICATION_MAP):
-			if arguments[k] != v:
-				raise AssertionError('{} did not match expected {}'.format(arguments[k], v))
-
-		kwargs = {}
-		for i, v in enumerate(arguments):
-			if i not in cls.DAILY_SUMMARY_VERIFICATION_MAP:
-				k = cls.DAILY_SUMMARY_ATTRIBUTE_MAP[i][0]
-				if v == cls.DAILY_SUMMARY_ATTRIBUTE_MAP[i][2]:
-					kwargs[k] = None
-				else:
-					kwargs[k] = cls.DAILY_SUMMARY_ATTRIBUTE_MAP[i][1](v)
+		return cls.load_from_wlk_buffer(file_handle.read(cls.DAILY_SUMMARY_LENGTH), 0, year, month, day)
 
-		return cls(date=datetime.date(year, month, day), **kwargs)
+	@classmethod
+	def load_from_wlk_buffer(cls, buffer, offset, year, month, day):
+		kwargs = cls.DAILY_SUMMARY_FIELD_DECODER(cls.DAILY_SUMMARY_STRUCT.unpack_from(buffer, offset))
+		kwargs['date'] = datetime.date(year, month, day)
+		return cls(kwargs)
 
 
 class ArchiveIntervalRecord(RecordDict):
+	__slots__ = ()
+
 	RECORD_FORMAT_WLK = (
-		'=b'  # '1'
+		'<b'  # '1'
 		'b'  # minutes in this record
 		'2x'  # icon flags and oter flags (ignored)
 		'h'  # minutes past midnight
@@ -340,8 +528,8 @@ class ArchiveIntervalRecord(RecordDict):
 		'h'  # high rain rate this time period in raw clicks/hr
 		'h'  # wind speed in tenths of miles per hour
 		'h'  # hi wind speed this time period in tenths of miles per hour
-		'b'  # prevailing wind direction (0-15, 255)
-		'b'  # hi wind speed direction (0-15, 255)
+		'B'  # prevailing wind direction (0-15, 255)
+		'B'  # hi wind speed direction (0-15, 255)
 		'h'  # number of wind samples this time period
 		'h'  # average solar rad this time period in watts / meter squared
 		'h'  # high solar radiation this time period in watts / meter squared
@@ -350,7 +538,7 @@ class ArchiveIntervalRecord(RecordDict):
 		'50x'  # other unused items (ignored)
 	)
 	RECORD_FORMAT_DOWNLOAD = (
-		'=hh'  # date and time stamps
+		'<hh'  # date and time stamps
 		'h'  # current outside temp in tenths of degrees
 		'h'  # hi outside temp this time period in tenths of degrees
 		'h'  # low outside temp this time period in tenths of degrees
@@ -374,8 +562,10 @@ class ArchiveIntervalRecord(RecordDict):
 		'B'  # Download record type (0xFF = Rev A, 0x00 = Rev B)
 		'9x'  # unused for now (ignored)
 	)
-	RECORD_LENGTH_WLK = 88
-	RECORD_LENGTH_DOWNLOAD = 52
+	RECORD_STRUCT_WLK = struct.Struct(RECORD_FORMAT_WLK)
+	RECORD_STRUCT_DOWNLOAD = struct.Struct(RECORD_FORMAT_DOWNLOAD)
+	RECORD_LENGTH_WLK = RECORD_STRUCT_WLK.size
+	RECORD_LENGTH_DOWNLOAD = RECORD_STRUCT_DOWNLOAD.size
 	RECORD_VERIFICATION_MAP_WLK = {
 		0: 1,
 	}
@@ -399,8 +589,8 @@ class ArchiveIntervalRecord(RecordDict):
 		('__special', STRAIGHT_NUMBER, None, ),
 		('wind_speed', TENTHS, DASH_SMALL, ),
 		('wind_speed_high', TENTHS, DASH_ZERO, ),
-		('wind_direction_prevailing', WindDirection, DASH_SMALL, ),
-		('wind_direction_speed_high', WindDirection, DASH_SMALL, ),
+		('wind_direction_prevailing', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
+		('wind_direction_speed_high', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
 		('number_of_wind_samples', STRAIGHT_NUMBER, DASH_ZERO, ),
 		('solar_radiation', STRAIGHT_NUMBER, DASH_LARGE_NEGATIVE, ),
 		('solar_radiation_high', STRAIGHT_NUMBER, DASH_LARGE_NEGATIVE, ),
@@ -423,116 +613,216 @@ class ArchiveIntervalRecord(RecordDict):
 		('humidity_outside', STRAIGHT_NUMBER, DASH_SMALL, ),
 		('wind_speed', STRAIGHT_DECIMAL, DASH_SMALL, ),
 		('wind_speed_high', STRAIGHT_DECIMAL, DASH_ZERO, ),
-		('wind_direction_speed_high', WindDirection, DASH_SMALL, ),
-		('wind_direction_prevailing', WindDirection, DASH_SMALL, ),
+		('wind_direction_speed_high', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
+		('wind_direction_prevailing', WIND_DIRECTION_FROM_CODE, DASH_SMALL, ),
 		('uv_index', TENTHS, DASH_SMALL, ),
 		('evapotranspiration', THOUSANDTHS, DASH_ZERO, ),
 		('solar_radiation_high', STRAIGHT_NUMBER, DASH_LARGE, ),
 		('uv_index_high', TENTHS, DASH_SMALL, ),
 		('record_version', STRAIGHT_NUMBER, None, ),
 	)
-
 	RECORD_WIND_DIRECTION_SPECIAL = (
 		('wind_direction_prevailing', 'wind_direction_prevailing_degrees', ),
 		('wind_direction_speed_high', 'wind_direction_speed_high_degrees', ),
 	)
+	RECORD_VERIFICATION_WLK = tuple(sorted(RECORD_VERIFICATION_MAP_WLK.items()))
+	RECORD_VERIFICATION_DOWNLOAD = tuple(sorted(RECORD_VERIFICATION_MAP_DOWNLOAD.items()))
+	RECORD_FIELD_CONVERSIONS_WLK = _get_field_conversions(
+		RECORD_ATTRIBUTE_MAP_WLK,
+		RECORD_VERIFICATION_MAP_WLK,
+		RECORD_SPECIAL_HANDLING_WLK,
+	)
+	RECORD_FIELD_DECODER_WLK = staticmethod(_compile_field_decoder(
+		RECORD_FIELD_CONVERSIONS_WLK,
+		RECORD_VERIFICATION_WLK,
+		_get_derived_field_lookups(
+			RECORD_ATTRIBUTE_MAP_WLK,
+			RECORD_WIND_DIRECTION_SPECIAL,
+			_WIND_DIRECTION_DEGREES_BY_CODE,
+		),
+	))
+	RECORD_FIELD_CONVERSIONS_DOWNLOAD = _get_field_conversions(
+		RECORD_ATTRIBUTE_MAP_DOWNLOAD,
+		RECORD_VERIFICATION_MAP_DOWNLOAD,
+		RECORD_SPECIAL_HANDLING_DOWNLOAD,
+	)
+	RECORD_FIELD_DECODER_DOWNLOAD = staticmethod(_compile_field_decoder(
+		RECORD_FIELD_CONVERSIONS_DOWNLOAD,
+		RECORD_VERIFICATION_DOWNLOAD,
+		_get_derived_field_lookups(
+			RECORD_ATTRIBUTE_MAP_DOWNLOAD,
+			RECORD_WIND_DIRECTION_SPECIAL,
+			_WIND_DIRECTION_DEGREES_BY_CODE,
+		),
+	))
+
+	# A station's records repeat the same few rain codes (mostly zero clicks from its one collector) and rain rates
+	# (mostly zero), so each pair is decoded into its collector type, clicks, Decimal amount and Decimal rate once and
+	# shared after that. The pair is keyed as one int, the rain rate clicks above the 16-bit rain code.
+	RECORD_RAIN_VALUES_WLK = {}
 
 	@classmethod
 	def load_from_wlk(cls, file_handle, year, month, day):
-		arguments = struct.unpack_from(
-			cls.RECORD_FORMAT_WLK,
-			file_handle.read(cls.RECORD_LENGTH_WLK),
-		)
-
-		for k, v in six.iteritems(cls.RECORD_VERIFICATION_MAP_WLK):
-			if arguments[k] != v:
-				raise AssertionError('{} did not match expected {}'.format(arguments[k], v))
+		return cls.load_from_wlk_buffer(file_handle.read(cls.RECORD_LENGTH_WLK), 0, year, month, day)
 
-		kwargs = {}
-		for i, v in enumerate(arguments):
-			if i not in cls.RECORD_VERIFICATION_MAP_WLK and i not in cls.RECORD_SPECIAL_HANDLING_WLK:
-				k = cls.RECORD_ATTRIBUTE_MAP_WLK[i][0]
-				if v == cls.RECORD_ATTRIBUTE_MAP_WLK[i][2]:
-					kwargs[k] = None
-				else:
-					kwargs[k] = cls.RECORD_ATTRIBUTE_MAP_WLK[i][1](v)
+	@classmethod
+	def load_from_wlk_buffer(cls, buffer, offset, year, month, day):
+		midnight = datetime.datetime(year, month, day, 0, 0)
+		return cls._load_from_wlk_arguments(
+			cls.RECORD_STRUCT_WLK.unpack_from(buffer, offset),
+			midnight,
+			convert_datetime_to_timestamp(midnight),
+		)
 
-		record = cls(**kwargs)
+	@classmethod
+	def load_many_from_wlk_buffer(cls, buffer, offset, count, year, month, day):
+		# Loads `count` consecutive records (such as all the records for one day) in a single pass
+		load = cls._load_from_wlk_arguments
+		midnight = datetime.datetime(year, month, day, 0, 0)
+		midnight_timestamp = convert_datetime_to_timestamp(midnight)
 
-		rain_code = arguments[10]
-		rain_collector_type = rain_code & 0xF000
-		rain_clicks = rain_code & 0x0FFF
-		rain_rate_clicks = arguments[11]
+		return [load(arguments, midnight, midnight_timestamp) for arguments in cls._unpack_many_wlk(buffer, offset, count)]
 
-		record.rain_collector_type = RainCollectorTypeDatabase(rain_collector_type)
-		record.rain_amount_clicks = rain_clicks
-		record.rain_rate_clicks = rain_rate_clicks
-		record.rain_amount = record.rain_collector_type.clicks_to_inches(rain_clicks)
-		record.rain_rate = record.rain_collector_type.clicks_to_inches(rain_rate_clicks)
+	@classmethod
+	def load_columns_from_wlk_buffer(cls, buffer, offset, count, year, month, day):
+		# Decodes the same `count` consecutive records as load_many_from_wlk_buffer, to the same values, but returns
+		# them as one list per attribute (in record order) rather than as records, for callers that aggregate whole
+		# columns and have no use for a dict per record
+		rows = list(cls._unpack_many_wlk(buffer, offset, count))
+
+		raw = list(zip(*rows)) or [()] * len(cls.RECORD_ATTRIBUTE_MAP_WLK)
+
+		# A whole column is verified at once, and only searched for the mismatch to report when that fails
+		for k, v in cls.RECORD_VERIFICATION_WLK:
+			if raw[k].count(v) != len(raw[k]):
+				actual = next(actual for actual in raw[k] if actual != v)
+				raise AssertionError('{} did not match expected {}'.format(actual, v))
+		columns = {
+			name: _decode_field_column(raw[i], converter, dash)
+			for i, name, converter, dash in cls.RECORD_FIELD_CONVERSIONS_WLK
+		}
 
 		for k1, k2 in cls.RECORD_WIND_DIRECTION_SPECIAL:
-			if record[k1]:
-				record[k2] = record[k1].degrees
+			columns[k2] = [None if wind_direction is None else wind_direction.degrees for wind_direction in columns[k1]]
+
+		rain_codes = cls.RECORD_RAIN_VALUES_WLK
+		rain_keys = [(rain_rate_clicks << 16) | rain_code for rain_code, rain_rate_clicks in zip(raw[10], raw[11])]
+		for rain_key in set(rain_keys):
+			if rain_key not in rain_codes:
+				rain_codes[rain_key] = cls._decode_rain_wlk(rain_key & 0xFFFF, rain_key >> 16)
+		rains = [rain_codes[rain_key] for rain_key in rain_keys]
+
+		columns['rain_collector_type'] = [rain_collector_type for rain_collector_type, _, _, _ in rains]
+		columns['rain_amount_clicks'] = [rain_clicks for _, rain_clicks, _, _ in rains]
+		columns['rain_rate_clicks'] = list(raw[11])
+		columns['rain_amount'] = [rain_amount for _, _, rain_amount, _ in rains]
+		columns['rain_rate'] = [rain_rate for _, _, _, rain_rate in rains]
+
+		midnight = datetime.datetime(year, month, day, 0, 0)
+		midnight_timestamp = convert_datetime_to_timestamp(midnight)
+		dates = columns['date'] = []
+		timestamps = columns['timestamp'] = []
+		for minutes_past_midnight in columns['minutes_past_midnight']:
+			if 0 <= minutes_past_midnight < 1440:
+				minute_offset, packed_time = _MINUTE_OF_DAY_OFFSETS[minutes_past_midnight]
+				dates.append(midnight + minute_offset)
+				timestamps.append(midnight_timestamp + packed_time)
 			else:
-				record[k2] = None
+				date = midnight + datetime.timedelta(minutes=minutes_past_midnight)
+				dates.append(date)
+				timestamps.append(convert_datetime_to_timestamp(date))
 
-		record.date = (
-			datetime.datetime(year, month, day, 0, 0) + datetime.timedelta(minutes=record.minutes_past_midnight)
-		)
-		record.timestamp = convert_datetime_to_timestamp(record.date)
+		return columns
 
-		return record
+	@classmethod
+	def _unpack_many_wlk(cls, buffer, offset, count):
+		record_length = cls.RECORD_LENGTH_WLK
+		end = offset + (count * record_length)
+
+		if hasattr(cls.RECORD_STRUCT_WLK, 'iter_unpack'):
+			# The whole run is unpacked in C, from a copy of just those bytes (so no buffer export is left open on a
+			# memory-mapped file)
+			return cls.RECORD_STRUCT_WLK.iter_unpack(buffer[offset:end])
+
+		unpack_from = cls.RECORD_STRUCT_WLK.unpack_from  # Python 2 has no iter_unpack
+		return (unpack_from(buffer, record_offset) for record_offset in range(offset, end, record_length))
+
+	@staticmethod
+	def _decode_rain_wlk(rain_code, rain_rate_clicks):
+		# The top four bits are the rain collector type and the rest are the number of clicks
+		rain_collector_type = _RAIN_COLLECTOR_TYPE_DATABASE_BY_NIBBLE[rain_code >> 12]
+		if rain_collector_type is None:
+			raise ValueError('{} is not a valid RainCollectorTypeDatabase'.format(rain_code & 0xF000))
+		rain_clicks = rain_code & 0x0FFF
+		inches_per_click = rain_collector_type.inches_per_click
+		return rain_collector_type, rain_clicks, rain_clicks * inches_per_click, rain_rate_clicks * inches_per_click
+
+	@classmethod
+	def _load_from_wlk_arguments(cls, arguments, midnight, midnight_timestamp):
+		kwargs = cls.RECORD_FIELD_DECODER_WLK(arguments)
+
+		rain_rate_clicks = arguments[11]
+		rain_key = (rain_rate_clicks << 16) | arguments[10]
+		rain = cls.RECORD_RAIN_VALUES_WLK.get(rain_key)
+		if rain is None:
+			rain = cls.RECORD_RAIN_VALUES_WLK[rain_key] = cls._decode_rain_wlk(arguments[10], rain_rate_clicks)
+		rain_collector_type, rain_clicks, rain_amount, rain_rate = rain
+
+		kwargs['rain_collector_type'] = rain_collector_type
+		kwargs['rain_amount_clicks'] = rain_clicks
+		kwargs['rain_rate_clicks'] = rain_rate_clicks
+		kwargs['rain_amount'] = rain_amount
+		kwargs['rain_rate'] = rain_rate
+
+		minutes_past_midnight = kwargs['minutes_past_midnight']
+		if 0 <= minutes_past_midnight < 1440:
+			# Same day, so the shared offset and packed time for that minute can be added to the day's values directly
+			offset, packed_time = _MINUTE_OF_DAY_OFFSETS[minutes_past_midnight]
+			kwargs['date'] = midnight + offset
+			kwargs['timestamp'] = midnight_timestamp + packed_time
+		else:
+			# The end-of-day record falls on midnight of the following day (or month, or year)
+			kwargs['date'] = date = midnight + datetime.timedelta(minutes=minutes_past_midnight)
+			kwargs['timestamp'] = convert_datetime_to_timestamp(date)
+
+		# Everything is decoded into a plain dict first, so the record is built in one step with no per-value
+		# attribute assignments on the record itself
+		return cls(kwargs)
 
 	@classmethod
 	def load_from_download(cls, response_handle, minutes_covered):
-		arguments = struct.unpack_from(
-			cls.RECORD_FORMAT_DOWNLOAD,
-			response_handle.read(cls.RECORD_LENGTH_DOWNLOAD),
-		)
+		return cls.load_from_download_buffer(response_handle.read(cls.RECORD_LENGTH_DOWNLOAD), 0, minutes_covered)
+
+	@classmethod
+	def load_from_download_buffer(cls, buffer, offset, minutes_covered):
+		arguments = cls.RECORD_STRUCT_DOWNLOAD.unpack_from(buffer, offset)
 		if arguments[0] < 1:
 			print('WARN: Record ignored due to datestamp < 1: date %s, time %s' % (arguments[0], arguments[1]))
 			return None
 
-		for k, v in six.iteritems(cls.RECORD_VERIFICATION_MAP_DOWNLOAD):
-			if arguments[k] != v:
-				raise AssertionError('{} did not match expected {}'.format(arguments[k], v))
-
-		kwargs = {}
-		for i, v in enumerate(arguments):
-			if i not in cls.RECORD_VERIFICATION_MAP_DOWNLOAD and i not in cls.RECORD_SPECIAL_HANDLING_DOWNLOAD:
-				k = cls.RECORD_ATTRIBUTE_MAP_DOWNLOAD[i][0]
-				if v == cls.RECORD_ATTRIBUTE_MAP_DOWNLOAD[i][2]:
-					kwargs[k] = None
-				else:
-					kwargs[k] = cls.RECORD_ATTRIBUTE_MAP_DOWNLOAD[i][1](v)
-
-		record = cls(**kwargs)
+		kwargs = cls.RECORD_FIELD_DECODER_DOWNLOAD(arguments)
 
-		record.minutes_covered = minutes_covered
+		kwargs['minutes_covered'] = minutes_covered
 
 		rain_clicks = arguments[5]
 		rain_rate_clicks = arguments[6]
+		rain_collector_type = RainCollectorTypeSerial.inches_0_01
+		inches_per_click = rain_collector_type.inches_per_click
+		kwargs['rain_collector_type'] = rain_collector_type
+		kwargs['rain_amount_clicks'] = rain_clicks
+		kwargs['rain_rate_clicks'] = rain_rate_clicks
+		kwargs['rain_amount'] = rain_clicks * inches_per_click
+		kwargs['rain_rate'] = rain_rate_clicks * inches_per_click
 
-		record.rain_collector_type = RainCollectorTypeSerial.inches_0_01
-		record.rain_amount_clicks = rain_clicks
-		record.rain_rate_clicks = rain_rate_clicks
-		record.rain_amount = record.rain_collector_type.clicks_to_inches(rain_clicks)
-		record.rain_rate = record.rain_collector_type.clicks_to_inches(rain_rate_clicks)
-
-		for k1, k2 in cls.RECORD_WIND_DIRECTION_SPECIAL:
-			if record[k1]:
-				record[k2] = record[k1].degrees
-			else:
-				record[k2] = None
-
-		record.timestamp = (arguments[0] << 16) + arguments[1]
-		record.date = convert_timestamp_to_datetime(record.timestamp)
+		timestamp = (arguments[0] << 16) + arguments[1]
+		kwargs['timestamp'] = timestamp
+		kwargs['date'] = convert_timestamp_to_datetime(timestamp)
 
-		return record
+		return cls(kwargs)
 
 
 class LoopRecord(RecordDict):
-	RECORD_LENGTH = 99
+	__slots__ = ()
 
 	LOOP1_RECORD_TYPE = 0
 	LOOP2_RECORD_TYPE = 1
@@ -588,6 +878,8 @@ class LoopRecord(RecordDict):
 		'c'  # Should be '\r'
 		'H'  # Cyclic redundancy check (CRC)
 	)
+	LOOP2_RECORD_STRUCT = struct.Struct(LOOP2_RECORD_FORMAT)
+	RECORD_LENGTH = LOOP2_RECORD_STRUCT.size  # 99 bytes, the same for LOOP1 and LOOP2
 
 	LOOP2_RECORD_VERIFICATION_MAP_WLK = {
 		0: b'LOO',
@@ -611,6 +903,14 @@ class LoopRecord(RecordDict):
 
 	LOOP2_RECORD_SPECIAL_HANDLING = frozenset(LOOP2_RECORD_VERIFICATION_MAP_WLK.keys())
 
+	# The verified fields are unpacked on their own, by a struct that skips everything else, and checked with one tuple
+	# comparison; only when that fails are they checked one by one to report the mismatch
+	LOOP2_RECORD_VERIFICATION = tuple(sorted(LOOP2_RECORD_VERIFICATION_MAP_WLK.items()))
+	LOOP2_RECORD_VERIFICATION_STRUCT = struct.Struct(
+		_get_struct_format_subset(LOOP2_RECORD_FORMAT, LOOP2_RECORD_VERIFICATION_MAP_WLK),
+	)
+	LOOP2_RECORD_VERIFIED_VALUES = tuple(v for _, v in LOOP2_RECORD_VERIFICATION)
+
 	LOOP2_RECORD_ATTRIBUTE_MAP = (
 		('_special', STRAIGHT_NUMBER, None, ),
 		('barometric_trend', STRAIGHT_NUMBER, 80, ),
@@ -649,11 +949,28 @@ class LoopRecord(RecordDict):
 		('minute_in_hour', STRAIGHT_NUMBER, 60, ),
 	)
 
+	# Likewise, the data fields are unpacked by a struct that skips the verified fields (and the CRC, which is computed
+	# over the raw packet), so the decoder gets a tuple of just the values it stores, indexed by this reduced map
+	LOOP2_RECORD_DATA_INDEXES = tuple(
+		i for i, _, _, _ in _get_field_conversions(LOOP2_RECORD_ATTRIBUTE_MAP, LOOP2_RECORD_SPECIAL_HANDLING)
+	)
+	LOOP2_RECORD_DATA_STRUCT = struct.Struct(_get_struct_format_subset(LOOP2_RECORD_FORMAT, LOOP2_RECORD_DATA_INDEXES))
+	LOOP2_RECORD_DATA_ATTRIBUTE_MAP = operator.itemgetter(*LOOP2_RECORD_DATA_INDEXES)(LOOP2_RECORD_ATTRIBUTE_MAP)
+
+	LOOP2_RECORD_FIELD_CONVERSIONS = _get_field_conversions(LOOP2_RECORD_DATA_ATTRIBUTE_MAP)
+	LOOP2_RECORD_FIELD_DECODER = staticmethod(_compile_field_decoder(LOOP2_RECORD_FIELD_CONVERSIONS))
+
+	# Any other trend value (including the 80 dash value, which has already been decoded to None) means no trend
+	LOOP_BAROMETRIC_TRENDS = {trend.value: trend for trend in BarometricTrend}
+
 	LOOP_WIND_DIRECTION_SPECIAL = (
 		('wind_direction_degrees', 'wind_direction', ),
 		('wind_speed_10_minute_gust_direction_degrees', 'wind_speed_10_minute_gust_direction', ),
 	)
 
+	# The LOOP packets do not contain the rain collector type, unfortunately, so every click is assumed to be 0.01"
+	LOOP_RAIN_INCHES_PER_CLICK = RainCollectorTypeSerial.inches_0_01.inches_per_click
+
 	LOOP_RAIN_AMOUNT_SPECIAL = (
 		('rain_rate_clicks', 'rain_rate', ),
 		('rain_clicks_this_storm', 'rain_amount_this_storm', ),
@@ -663,71 +980,91 @@ class LoopRecord(RecordDict):
 		('rain_clicks_24_hours', 'rain_amount_24_hours', ),
 	)
 
+	LOOP2_RECORD_WIND_DIRECTION_SPECIAL = _get_derived_field_indexes(
+		LOOP2_RECORD_DATA_ATTRIBUTE_MAP,
+		LOOP_WIND_DIRECTION_SPECIAL,
+	)
+	LOOP2_RECORD_RAIN_AMOUNT_SPECIAL = _get_derived_field_indexes(
+		LOOP2_RECORD_DATA_ATTRIBUTE_MAP,
+		LOOP_RAIN_AMOUNT_SPECIAL,
+	)
+
 	@classmethod
 	def load_loop_1_2_from_connection(cls, socket_file):
 		arguments = cls._get_loop_1_arguments(socket_file, True)
 		arguments.update(cls._get_loop_2_arguments(socket_file))
-		return cls(**arguments)
+		return cls(arguments)
 
 	@classmethod
 	def load_loop_1_from_connection(cls, socket_file):
-		return cls(**cls._get_loop_1_arguments(socket_file))
+		return cls(cls._get_loop_1_arguments(socket_file))
 
 	@classmethod
-	def load_loop_2_from_connection(cls, socket_file):
-		return cls(**cls._get_loop_2_arguments(socket_file))
+	def load_loop_2_from_connection(cls, socket_file, buffer=None):
+		# When reading many packets in a row from a binary file, pass a reusable bytearray(RECORD_LENGTH) as `buffer` to
+		# read each packet into it rather than into a newly allocated bytes object
+		return cls(cls._get_loop_2_arguments(socket_file, buffer))
+
+	@classmethod
+	def load_loop_2_from_buffer(cls, buffer, offset=0):
+		return cls(cls._get_loop_2_arguments_from_buffer(buffer, offset))
+
+	@classmethod
+	def load_many_loop_2_from_buffer(cls, buffer, offset, count):
+		# Loads `count` consecutive LOOP2 packets (such as a captured stream) in a single pass
+		record_length = cls.RECORD_LENGTH
+		get_arguments = cls._get_loop_2_arguments_from_buffer
+
+		return [
+			cls(get_arguments(buffer, record_offset))
+			for record_offset in range(offset, offset + (count * record_length), record_length)
+		]
 
 	@classmethod
 	def _get_loop_1_arguments(cls, socket_file, unique_only=False):
 		raise NotImplementedError()
 
 	@classmethod
-	def _get_loop_2_arguments(cls, socket_file):
-		data = socket_file.read(cls.RECORD_LENGTH)
-
-		unpacked = struct.unpack_from(cls.LOOP2_RECORD_FORMAT, data)
+	def _get_loop_2_arguments(cls, socket_file, buffer=None):
+		if buffer is None:
+			return cls._get_loop_2_arguments_from_buffer(socket_file.read(cls.RECORD_LENGTH), 0)
 
-		for k, v in six.iteritems(cls.LOOP2_RECORD_VERIFICATION_MAP_WLK):
-			if unpacked[k] != v:
-				raise AssertionError('{} did not match expected {}'.format(unpacked[k], v))
+		length = socket_file.readinto(buffer)
+		if length != cls.RECORD_LENGTH:
+			raise IOError('Read {} bytes but expected a {}-byte LOOP2 packet'.format(length, cls.RECORD_LENGTH))
+		return cls._get_loop_2_arguments_from_buffer(buffer, 0)
 
-		arguments = {'crc_match': calculate_weatherlink_crc(data) == 0, 'record_type': 2}
+	@classmethod
+	def _get_loop_2_arguments_from_buffer(cls, buffer, offset):
+		verified = cls.LOOP2_RECORD_VERIFICATION_STRUCT.unpack_from(buffer, offset)
+		if verified != cls.LOOP2_RECORD_VERIFIED_VALUES:
+			for actual, (_, v) in zip(verified, cls.LOOP2_RECORD_VERIFICATION):
+				if actual != v:
+					raise AssertionError('{} did not match expected {}'.format(actual, v))
 
-		last = len(cls.LOOP2_RECORD_ATTRIBUTE_MAP)
-		for i, v in enumerate(unpacked):
-			if (i < last and i not in cls.LOOP2_RECORD_VERIFICATION_MAP_WLK and
-						i not in cls.LOOP2_RECORD_SPECIAL_HANDLING):
-				k = cls.LOOP2_RECORD_ATTRIBUTE_MAP[i][0]
-				if v == cls.LOOP2_RECORD_ATTRIBUTE_MAP[i][2]:
-					arguments[k] = None
-				else:
-					arguments[k] = cls.LOOP2_RECORD_ATTRIBUTE_MAP[i][1](v)
+		unpacked = cls.LOOP2_RECORD_DATA_STRUCT.unpack_from(buffer, offset)
 
-		cls._post_process_arguments(arguments)
+		arguments = cls.LOOP2_RECORD_FIELD_DECODER(unpacked)
 
-		return arguments
+		# The packet is always a buffer here, so its CRC goes straight to the C routine behind calculate_weatherlink_crc
+		data = memoryview(buffer)[offset:offset + cls.RECORD_LENGTH]
+		arguments['crc_match'] = binascii.crc_hqx(data, 0) == 0
+		arguments['record_type'] = 2
 
-	@classmethod
-	def _post_process_arguments(cls, arguments):
-		# The online download does not contain this information, unfortunately
-		rain_collector_type = RainCollectorTypeSerial.inches_0_01
+		# The derived values are computed from the raw unpacked values, in the same pass, rather than by re-reading the
+		# decoded arguments afterward
+		arguments['barometric_trend'] = cls.LOOP_BAROMETRIC_TRENDS.get(arguments['barometric_trend'])
 
-		try:
-			arguments['barometric_trend'] = BarometricTrend(arguments['barometric_trend'])
-		except ValueError:
-			arguments['barometric_trend'] = None
+		from_degrees = WindDirection.from_degrees  # already None for zero (no wind)
+		for i, k in cls.LOOP2_RECORD_WIND_DIRECTION_SPECIAL:
+			arguments[k] = from_degrees(unpacked[i])
 
-		for k1, k2 in cls.LOOP_WIND_DIRECTION_SPECIAL:
-			if arguments[k1]:
-				arguments[k2] = WindDirection.from_degrees(arguments[k1])
-			else:
-				arguments[k2] = None
+		inches_per_click = cls.LOOP_RAIN_INCHES_PER_CLICK
+		for i, k in cls.LOOP2_RECORD_RAIN_AMOUNT_SPECIAL:
+			clicks = unpacked[i]
+			arguments[k] = clicks * inches_per_click if clicks else None  # zero clicks means no rain
 
-		for k1, k2 in cls.LOOP_RAIN_AMOUNT_SPECIAL:
-			if arguments[k1]:
-				arguments[k2] = rain_collector_type.clicks_to_inches(arguments[k1])
-			else:
-				arguments[k2] = None
+		return arguments
 
 
 WEATHERLINK_CRC_TABLE = (
@@ -766,11 +1103,20 @@ WEATHERLINK_CRC_TABLE = (
 )
 
 
-def calculate_weatherlink_crc(data_bytes):
-	crc = 0
-	cast_with_ord = isinstance(data_bytes, six.string_types)
-	for i, byte in enumerate(data_bytes):
-		if cast_with_ord:
-			byte = ord(byte)
-		crc = WEATHERLINK_CRC_TABLE[((crc >> 8) & 0xFF) ^ byte] ^ ((crc << 8) & 0xFF00)
-	return crc
+def calculate_weatherlink_crc(data_bytes, crc=0):
+	# This is CRC-16-CCITT in its XModem form (polynomial 0x1021, initial value 0, no reflection), which is exactly what
+	# binascii.crc_hqx computes, in C, from the same table as WEATHERLINK_CRC_TABLE, for anything supporting the buffer
+	# protocol (bytes, bytearray, memoryview, mmap, array, etc.), so that common case is tried before any type checks.
+	# Other CRC-16/XModem implementations (such as crcmod.mkCrcFun(0x11021, initCrc=0, xorOut=0)) give the same results.
+	# To check data that arrives (or is read) in pieces, pass the CRC of everything before each piece as `crc`, rather
+	# than joining the pieces into one large buffer first.
+	try:
+		return binascii.crc_hqx(data_bytes, crc)
+	except (TypeError, UnicodeError):
+		pass
+
+	if isinstance(data_bytes, six.text_type):
+		data_bytes = data_bytes.encode('latin-1')  # text must hold one character per byte
+	else:
+		data_bytes = bytearray(data_bytes)  # anything else, such as a list of byte values, is copied into a buffer once
+	return binascii.crc_hqx(data_bytes, crc)
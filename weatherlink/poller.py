@@ -30,7 +30,7 @@ class Poller(ConfigurationSettingMixin, SerialCommunicator):
 	def __init__(self, *args, **kwargs):
 		super(Poller, self).__init__(*args, **kwargs)
 
-		self.packet_type = LoopRecord.PACKET_TYPE_LOOP2
+		self.packet_type = self.PACKET_TYPE_LOOP2
 		self._stop_event = None
 
 	def poll(self, num_packets):
@@ -59,30 +59,73 @@ class Poller(ConfigurationSettingMixin, SerialCommunicator):
 		self._send_instruction(self.POLL_INSTRUCTION % (self.packet_type, num_packets, ))
 
 	def _receive_loop_packets(self, num_packets, callback=None):
-		packets = []
+		# The number of packets is known up front, so the list is allocated at its final size and filled in place
+		packets = None if callback else [None] * num_packets
+
+		# The packet type cannot change mid-poll, so the loader is picked once rather than for every packet
+		if self.packet_type == self.PACKET_TYPE_LOOP1 | self.PACKET_TYPE_LOOP2:
+			load_packet = LoopRecord.load_loop_1_2_from_connection
+		elif self.packet_type == self.PACKET_TYPE_LOOP1:
+			load_packet = LoopRecord.load_loop_1_from_connection
+		else:
+			load_packet = None
 
 		with self._get_file_handle() as handle:
+			# Binary handles can read every LOOP2 packet into the same buffer
+			buffer = bytearray(LoopRecord.RECORD_LENGTH) if hasattr(handle, 'readinto') else None
+
 			for i in range(0, num_packets):
 				if self._stop_event and self._stop_event.is_set():
 					self._send_data('\r')
 					return
 
-				if self.packet_type == self.PACKET_TYPE_LOOP1 | self.PACKET_TYPE_LOOP2:
-					packet = LoopRecord.load_loop_1_2_from_connection(handle)
-				elif self.packet_type == self.PACKET_TYPE_LOOP1:
-					packet = LoopRecord.load_loop_1_from_connection(handle)
+				if load_packet:
+					packet = load_packet(handle)
 				else:
-					packet = LoopRecord.load_loop_2_from_connection(handle)
+					packet = LoopRecord.load_loop_2_from_connection(handle, buffer)
 
 				if callback:
 					callback(packet)
 				else:
-					packets.append(packet)
+					packets[i] = packet
 
 		if not callback:
 			return packets
 
 
+class LoopPacketReader(object):
+	"""
+	Assembles LOOP2 packets from data received in chunks of any size, such as from a non-blocking socket watched by a
+	selector or from an asyncio protocol's `data_received`, so that a single event loop can poll many stations without
+	a thread (and a blocking read) for each. It does no I/O of its own: send the poll instruction (and read its ACK)
+	as usual, then feed it the data that follows.
+	"""
+	def __init__(self):
+		self._buffer = bytearray()
+
+	def feed(self, data):
+		"""
+		Adds received data and returns the packets it completes, in order (an empty list if it completes none). Any
+		trailing partial packet is kept for the next call.
+
+		:param data: The data received
+		:type data: str | bytes | bytearray
+
+		:return: The completed packets
+		:rtype: list[LoopRecord]
+		"""
+		self._buffer.extend(data)
+
+		count = len(self._buffer) // LoopRecord.RECORD_LENGTH
+		if not count:
+			return []
+
+		end = count * LoopRecord.RECORD_LENGTH
+		packets = bytes(self._buffer[:end])
+		del self._buffer[:end]
+		return LoopRecord.load_many_loop_2_from_buffer(packets, 0, count)
+
+
 class IPPoller(SerialIPCommunicator, Poller):
 	def __init__(self, host, port=SerialIPCommunicator.DEFAULT_PORT_NUMBER):
 		super(IPPoller, self).__init__(host, port)
@@ -210,17 +210,28 @@ class SerialIPCommunicator(SerialCommunicator):
 			self._socket = None
 
 	def _send_data(self, data):
+		if isinstance(data, six.text_type):
+			data = data.encode('ascii')  # instructions are plain ASCII text, but sockets only send bytes in Python 3
 		self._socket.sendall(data)
 
 	def _read_data(self, length):
-		return self._socket.recv(1)
+		# Reads straight into one buffer until it is full, so a reply that has already arrived takes a single call
+		data = bytearray(length)
+		view = memoryview(data)
+		received = 0
+		while received < length:
+			count = self._socket.recv_into(view[received:])
+			if not count:
+				raise IOError('Connection closed after receiving %s of %s bytes.' % (received, length, ))
+			received += count
+		return bytes(data)
 
 	@contextlib.contextmanager
 	def _get_file_handle(self):
 		handle = None
 		exc = None
 		try:
-			handle = self._socket.makefile()
+			handle = self._socket.makefile('rb')  # the protocol is binary, so reads return bytes and support readinto
 			yield handle
 		except Exception as e:
 			exc = e
@@ -239,6 +250,7 @@ class SerialIPCommunicator(SerialCommunicator):
 class ConfigurationSettingMixin(SerialCommunicator):
 	CONFIG_READ_INSTRUCTION = 'EEBRD %s %s\n'
 	CONFIG_WRITE_INSTRUCTION = 'EEBWR %s %s\n'
+	CONFIG_CRC_STRUCT = struct.Struct('>H')  # unlike other little-endian data, CRCs are big-endian (eye roll)
 
 	CONFIG_SETTING_SETUP_BITS = ('2B', '01', )
 
@@ -271,7 +283,7 @@ class ConfigurationSettingMixin(SerialCommunicator):
 		self._send_instruction(self.CONFIG_READ_INSTRUCTION % (setting_address, setting_length, ))
 
 		with self._get_file_handle() as handle:
-			setting = handle.read(int('0x%s' % setting_length, 16) + 2)  # must read the CRC
+			setting = handle.read(int(setting_length, 16) + 2)  # must read the CRC
 
 		if confirm_crc and calculate_weatherlink_crc(setting) != 0:
 			raise CRCValidationError('CRC for response %s does not resolve to zero.' % repr(setting))
@@ -297,13 +309,13 @@ class ConfigurationSettingMixin(SerialCommunicator):
 		:raises CRCValidationError: If the calculated CRC, appended to the setting value, does not result in a CRC
 									validation value of 0.
 		"""
-		if len(setting_value) != int('0x%s' % setting_length, 16):
+		if len(setting_value) != int(setting_length, 16):
 			raise ValueError('The length of the setting value does not match the setting length.')
 
 		self._send_instruction(self.CONFIG_WRITE_INSTRUCTION % (setting_address, setting_length, ))
 
 		crc = calculate_weatherlink_crc(setting_value)
-		data = setting_value + struct.pack('>H', crc)  # Unlike other little-endian data, CRCs are big-endian (eye roll)
+		data = setting_value + self.CONFIG_CRC_STRUCT.pack(crc)
 
 		verified_crc = calculate_weatherlink_crc(data)
 		if verified_crc != 0:
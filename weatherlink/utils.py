@@ -647,7 +647,37 @@ def _append_to_list(l, v):
 		l.append(v)
 
 
-def calculate_all_record_values(record):
+def calculate_all_record_values(record, cache=None):
+	"""
+	Calculates all of the derived values (wind run distance, wet bulb temperature, dew point, heat index, wind chill,
+	and THW/THSW indexes) that can be calculated from the physical measurements in the given archive record.
+
+	When calculating values for many records, pass the same `cache` dictionary to each call. Calculation results are
+	stored in it, keyed on their inputs, so that identical calculations are not repeated across records.
+
+	:param record: The archive record containing the physical measurements
+	:type record: weatherlink.models.RecordDict
+	:param cache: An optional dictionary in which to cache calculation results between calls
+	:type cache: dict
+
+	:return: A dictionary of derived value names to their calculated values
+	:rtype: dict
+	"""
+	if cache is None:
+		cache = {}
+
+	def calculate(function, *args):
+		# Records frequently repeat the same inputs (current, high, and low temperatures are often identical, and
+		# conditions change slowly between records), so each distinct calculation is only performed once. Inputs are
+		# keyed on their exact type and value, because equal Decimals can still differ in exponent (72 and 72.0),
+		# which a calculation could carry into its result.
+		key = (function, ) + tuple((type(arg), str(arg)) for arg in args)
+		try:
+			return cache[key]
+		except KeyError:
+			value = cache[key] = function(*args)
+			return value
+
 	arguments = {}
 
 	wind_speed = _as_decimal(record.get('wind_speed'))
@@ -669,15 +699,25 @@ def calculate_all_record_values(record):
 
 	if humidity_outside and barometric_pressure:
 		if temperature_outside:
-			a = calculate_wet_bulb_temperature(temperature_outside, humidity_outside, barometric_pressure)
+			a = calculate(calculate_wet_bulb_temperature, temperature_outside, humidity_outside, barometric_pressure)
 			if a:
 				arguments['temperature_wet_bulb'] = a
 		if temperature_outside_low:
-			a = calculate_wet_bulb_temperature(temperature_outside_low, humidity_outside, barometric_pressure)
+			a = calculate(
+				calculate_wet_bulb_temperature,
+				temperature_outside_low,
+				humidity_outside,
+				barometric_pressure,
+			)
 			if a:
 				arguments['temperature_wet_bulb_low'] = a
 		if temperature_outside_high:
-			a = calculate_wet_bulb_temperature(temperature_outside_high, humidity_outside, barometric_pressure)
+			a = calculate(
+				calculate_wet_bulb_temperature,
+				temperature_outside_high,
+				humidity_outside,
+				barometric_pressure,
+			)
 			if a:
 				arguments['temperature_wet_bulb_high'] = a
 
@@ -685,14 +725,14 @@ def calculate_all_record_values(record):
 		a = []
 		b = []
 		if temperature_outside:
-			_append_to_list(a, calculate_dew_point(temperature_outside, humidity_outside))
-			_append_to_list(b, calculate_heat_index(temperature_outside, humidity_outside))
+			_append_to_list(a, calculate(calculate_dew_point, temperature_outside, humidity_outside))
+			_append_to_list(b, calculate(calculate_heat_index, temperature_outside, humidity_outside))
 		if temperature_outside_low:
-			_append_to_list(a, calculate_dew_point(temperature_outside_low, humidity_outside))
-			_append_to_list(b, calculate_heat_index(temperature_outside_low, humidity_outside))
+			_append_to_list(a, calculate(calculate_dew_point, temperature_outside_low, humidity_outside))
+			_append_to_list(b, calculate(calculate_heat_index, temperature_outside_low, humidity_outside))
 		if temperature_outside_high:
-			_append_to_list(a, calculate_dew_point(temperature_outside_high, humidity_outside))
-			_append_to_list(b, calculate_heat_index(temperature_outside_high, humidity_outside))
+			_append_to_list(a, calculate(calculate_dew_point, temperature_outside_high, humidity_outside))
+			_append_to_list(b, calculate(calculate_heat_index, temperature_outside_high, humidity_outside))
 		if a:
 			arguments['dew_point_outside'] = a[0]
 			arguments['dew_point_outside_low'] = min(a)
@@ -703,8 +743,8 @@ def calculate_all_record_values(record):
 			arguments['heat_index_outside_high'] = max(b)
 
 	if humidity_inside and temperature_inside:
-		a = calculate_dew_point(temperature_inside, humidity_inside)
-		b = calculate_heat_index(temperature_inside, humidity_inside)
+		a = calculate(calculate_dew_point, temperature_inside, humidity_inside)
+		b = calculate(calculate_heat_index, temperature_inside, humidity_inside)
 		if a:
 			arguments['dew_point_inside'] = a
 		if b:
@@ -713,17 +753,17 @@ def calculate_all_record_values(record):
 	if (wind_speed or wind_speed_high) and (temperature_outside or temperature_outside_high or temperature_outside_low):
 		a = []
 		if wind_speed and temperature_outside:
-			_append_to_list(a, calculate_wind_chill(temperature_outside, wind_speed))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside, wind_speed))
 		if wind_speed and temperature_outside_high:
-			_append_to_list(a, calculate_wind_chill(temperature_outside_high, wind_speed))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside_high, wind_speed))
 		if wind_speed and temperature_outside_low:
-			_append_to_list(a, calculate_wind_chill(temperature_outside_low, wind_speed))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside_low, wind_speed))
 		if wind_speed_high and temperature_outside:
-			_append_to_list(a, calculate_wind_chill(temperature_outside, wind_speed_high))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside, wind_speed_high))
 		if wind_speed_high and temperature_outside_high:
-			_append_to_list(a, calculate_wind_chill(temperature_outside_high, wind_speed_high))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside_high, wind_speed_high))
 		if wind_speed_high and temperature_outside_low:
-			_append_to_list(a, calculate_wind_chill(temperature_outside_low, wind_speed_high))
+			_append_to_list(a, calculate(calculate_wind_chill, temperature_outside_low, wind_speed_high))
 		if a:
 			arguments['wind_chill'] = a[0]
 			arguments['wind_chill_low'] = min(a)
@@ -735,14 +775,14 @@ def calculate_all_record_values(record):
 
 		a = []
 		if temperature_outside:
-			_append_to_list(a, calculate_thw_index(temperature_outside, humidity_outside, ws))
-			_append_to_list(a, calculate_thw_index(temperature_outside, humidity_outside, wsh))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside, humidity_outside, ws))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside, humidity_outside, wsh))
 		if temperature_outside_high:
-			_append_to_list(a, calculate_thw_index(temperature_outside_high, humidity_outside, ws))
-			_append_to_list(a, calculate_thw_index(temperature_outside_high, humidity_outside, wsh))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside_high, humidity_outside, ws))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside_high, humidity_outside, wsh))
 		if temperature_outside_low:
-			_append_to_list(a, calculate_thw_index(temperature_outside_low, humidity_outside, ws))
-			_append_to_list(a, calculate_thw_index(temperature_outside_low, humidity_outside, wsh))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside_low, humidity_outside, ws))
+			_append_to_list(a, calculate(calculate_thw_index, temperature_outside_low, humidity_outside, wsh))
 		if a:
 			arguments['thw_index'] = a[0]
 			arguments['thw_index_low'] = min(a)
@@ -751,52 +791,82 @@ def calculate_all_record_values(record):
 		if solar_radiation or solar_radiation_high:
 			a = []
 			if temperature_outside and solar_radiation:
-				_append_to_list(a, calculate_thsw_index(temperature_outside, humidity_outside, solar_radiation, ws))
-				_append_to_list(a, calculate_thsw_index(temperature_outside, humidity_outside, solar_radiation, wsh))
+				_append_to_list(
+					a,
+					calculate(calculate_thsw_index, temperature_outside, humidity_outside, solar_radiation, ws),
+				)
+				_append_to_list(
+					a,
+					calculate(calculate_thsw_index, temperature_outside, humidity_outside, solar_radiation, wsh),
+				)
 			if temperature_outside_high and solar_radiation:
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_high, humidity_outside, solar_radiation, ws),
+					calculate(calculate_thsw_index, temperature_outside_high, humidity_outside, solar_radiation, ws),
 				)
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_high, humidity_outside, solar_radiation, wsh),
+					calculate(calculate_thsw_index, temperature_outside_high, humidity_outside, solar_radiation, wsh),
 				)
 			if temperature_outside_low and solar_radiation:
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_low, humidity_outside, solar_radiation, ws),
+					calculate(calculate_thsw_index, temperature_outside_low, humidity_outside, solar_radiation, ws),
 				)
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_low, humidity_outside, solar_radiation, wsh),
+					calculate(calculate_thsw_index, temperature_outside_low, humidity_outside, solar_radiation, wsh),
 				)
 			if temperature_outside and solar_radiation_high:
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside, humidity_outside, solar_radiation_high, ws),
+					calculate(calculate_thsw_index, temperature_outside, humidity_outside, solar_radiation_high, ws),
 				)
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside, humidity_outside, solar_radiation_high, wsh),
+					calculate(calculate_thsw_index, temperature_outside, humidity_outside, solar_radiation_high, wsh),
 				)
 			if temperature_outside_high and solar_radiation_high:
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_high, humidity_outside, solar_radiation_high, ws),
+					calculate(
+						calculate_thsw_index,
+						temperature_outside_high,
+						humidity_outside,
+						solar_radiation_high,
+						ws,
+					),
 				)
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_high, humidity_outside, solar_radiation_high, wsh),
+					calculate(
+						calculate_thsw_index,
+						temperature_outside_high,
+						humidity_outside,
+						solar_radiation_high,
+						wsh,
+					),
 				)
 			if temperature_outside_low and solar_radiation_high:
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_low, humidity_outside, solar_radiation_high, ws),
+					calculate(
+						calculate_thsw_index,
+						temperature_outside_low,
+						humidity_outside,
+						solar_radiation_high,
+						ws,
+					),
 				)
 				_append_to_list(
 					a,
-					calculate_thsw_index(temperature_outside_low, humidity_outside, solar_radiation_high, wsh),
+					calculate(
+						calculate_thsw_index,
+						temperature_outside_low,
+						humidity_outside,
+						solar_radiation_high,
+						wsh,
+					),
 				)
 			if a:
 				arguments['thsw_index'] = a[0]
@@ -804,3 +874,22 @@ def calculate_all_record_values(record):
 				arguments['thsw_index_high'] = max(a)
 
 	return arguments
+
+
+def localize_station_datetime(d, time_zone):
+	"""
+	Attaches the station's time zone to the naive date and time of a record or summary. pytz zones are attached with
+	their `localize` method, because `replace(tzinfo=...)` would give them the zone's earliest (LMT) offset instead
+	of the one in effect at that time; any other `tzinfo`, such as a fixed offset, is attached as-is.
+
+	:param d: The naive date and time, in the station's local time
+	:type d: datetime.datetime
+	:param time_zone: The station's time zone
+	:type time_zone: datetime.tzinfo
+
+	:return: The same date and time, aware of the time zone
+	:rtype: datetime.datetime
+	"""
+	if hasattr(time_zone, 'localize'):
+		return time_zone.localize(d)
+	return d.replace(tzinfo=time_zone)